@@ -1,120 +1,2748 @@
-from PyQt6.QtCore import Qt, QUrl
-from PyQt6.QtWebEngineCore import QWebEnginePage
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, QUrl, pyqtSignal
+from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile, QWebEngineScript
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLineEdit, QSplitter
+    QPushButton, QToolButton, QLineEdit, QSplitter
 )
+import hashlib
 import json
+import logging
+import os
+import re
 import threading
 import time
+from collections import OrderedDict
+from datetime import datetime
 
 from browser.chat_window import ChatWindow
 from lib.models import Role
 
+logger = logging.getLogger(__name__)
+
+
+# Reader-mode extraction script. Installed once per page as a QWebEngineScript in
+# the application world, where it defines window.__sage.extractReader. Everything
+# the analyzer needs is collected by that one function, so each analysis is a single
+# short runJavaScript call.
+_EXTRACT_JS = """
+window.__sage = window.__sage || {};
+window.__sage.extractReader = (function() {
+    // Tags whose whole subtree is skipped
+    const UNWANTED_TAGS = new Set(['SCRIPT', 'STYLE', 'NAV', 'HEADER', 'FOOTER',
+                                   'ASIDE', 'NOSCRIPT', 'AD', 'IFRAME']);
+    const HEADING_RE = /^H[1-6]$/;
+
+    // Stop walking once this many characters are collected. Far more than any
+    // normal article, so saved pages keep their whole text, while pathological
+    // pages stay bounded.
+    const CONTENT_BUDGET = 500000;
+
+    // Candidate main content containers, in priority order
+    const MAIN_SELECTORS = [
+        'article',
+        '[role="main"]',
+        'main',
+        '#main-content',
+        '#content',
+        '.main-content',
+        '.content',
+        '.post-content'
+    ];
+    const MAIN_SELECTOR_LIST = MAIN_SELECTORS.join(', ');
+
+    function getReaderContent() {
+        // Helper function to get text content while preserving some structure.
+        // Uses an iterative TreeWalker rather than recursion so large pages
+        // don't pay for a function call per node.
+        function extractText(root) {
+            const walker = document.createTreeWalker(
+                root,
+                NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT,
+                {
+                    acceptNode(node) {
+                        if (node.nodeType !== Node.ELEMENT_NODE) return NodeFilter.FILTER_ACCEPT;
+
+                        // Headings, paragraphs and list items are always kept
+                        if (HEADING_RE.test(node.tagName) ||
+                            node.tagName === 'P' || node.tagName === 'LI') {
+                            return NodeFilter.FILTER_ACCEPT;
+                        }
+
+                        // Prune hidden elements and unwanted content with their subtrees
+                        if (node.style && (
+                            node.style.display === 'none' ||
+                            node.style.visibility === 'hidden'
+                        )) {
+                            return NodeFilter.FILTER_REJECT;
+                        }
+                        if (UNWANTED_TAGS.has(node.tagName)) {
+                            return NodeFilter.FILTER_REJECT;
+                        }
+
+                        return NodeFilter.FILTER_ACCEPT;
+                    }
+                }
+            );
+
+            // Advance past the current node's descendants
+            function skipSubtree() {
+                while (!walker.nextSibling()) {
+                    if (!walker.parentNode()) return null;
+                }
+                return walker.currentNode;
+            }
+
+            // Collect raw text chunks until the budget is spent; whitespace is
+            // normalized on the Python side. The saved page keeps everything
+            // collected, and only the copy sent to the LLM is cut shorter.
+            const parts = [];
+            let total = 0;
+            let truncated = false;
+
+            function push(text) {
+                text = text.trim();
+                if (!text) return;
+                parts.push(text);
+                total += text.length + 1;
+                truncated = total >= CONTENT_BUDGET;
+            }
+
+            let node = walker.nextNode();
+            while (node && !truncated) {
+                if (node.nodeType === Node.TEXT_NODE) {
+                    push(node.data);
+                    node = walker.nextNode();
+                } else if (HEADING_RE.test(node.tagName)) {
+                    // Handle headings specially
+                    push('## ' + node.textContent);
+                    node = skipSubtree();
+                } else if (node.tagName === 'P' || node.tagName === 'LI') {
+                    // Handle paragraphs and lists
+                    push(node.textContent);
+                    node = skipSubtree();
+                } else {
+                    node = walker.nextNode();
+                }
+            }
+
+            // The last chunk can overshoot the budget (one huge paragraph, say),
+            // so the text is capped here before it crosses the IPC boundary
+            return { text: parts.join(' ').slice(0, CONTENT_BUDGET), truncated: truncated };
+        }
+
+        // Try to find main content. A single query over the combined selector
+        // list finds every candidate; the priority order is then applied to that
+        // short list instead of re-running the selector engine per selector.
+        const candidates = document.querySelectorAll(MAIN_SELECTOR_LIST);
+        let mainContent = null;
+        for (let i = 0; i < MAIN_SELECTORS.length && !mainContent && candidates.length; i++) {
+            for (const element of candidates) {
+                if (element.matches(MAIN_SELECTORS[i])) {
+                    mainContent = element;
+                    break;
+                }
+            }
+        }
+
+        // If no main content found, use body
+        const root = mainContent || document.body;
+        const extracted = extractText(root);
+
+        // Read every meta tag in a single pass over <head>
+        const meta = {};
+        for (const el of (document.head ? document.head.children : [])) {
+            if (el.tagName !== 'META') continue;
+            const key = el.getAttribute('name') || el.getAttribute('property');
+            if (key) meta[key] = el.getAttribute('content') || '';
+        }
+
+        return {
+            title: document.title,
+            url: window.location.href,
+            description: meta.description || meta['og:description'] || '',
+            meta: meta,
+            content: extracted.text,
+            truncated: extracted.truncated
+        };
+    }
+
+    return getReaderContent;
+})();
+"""
+
+# The result is serialized in JS so it crosses IPC as one flat string instead of
+# being converted key by key through QVariantMap
+_EXTRACT_CALL_JS = "JSON.stringify(window.__sage.extractReader())"
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+# Leading/trailing whitespace on each line, without touching the newlines
+_LINE_EDGE_WS_RE = re.compile(r'^[^\S\n]+|[^\S\n]+$', re.MULTILINE)
+# Lines that could be headings: short and not ending in punctuation
+_HEADING_CANDIDATE_RE = re.compile(r'^(?=[^\n]{1,79}$)[^\n]*[^\n.,:;?!]$', re.MULTILINE)
+
+
+def _format_heading(match):
+    line = match.group(0)
+    return f'## {line}' if line.istitle() else line
+
+
+def clean_content(text):
+    """Clean and structure the content for markdown"""
+    # Replace multiple newlines with double newline for markdown paragraphs.
+    # A literal replace loop beats the regex engine and usually runs once.
+    while '\n\n\n' in text:
+        text = text.replace('\n\n\n', '\n\n')
+    text = _LINE_EDGE_WS_RE.sub('', text)
+
+    # Turn title-cased candidate lines into markdown headings
+    return _HEADING_CANDIDATE_RE.sub(_format_heading, text)
+
+
+# Reading speed used for the reading time estimate
+_WORDS_PER_MINUTE = 200
+
+
+def estimate_reading_time(content):
+    """Estimate reading time in minutes from normalized content"""
+    word_count = content.count(' ') + 1 if content else 0
+    # Ceiling division without going through float
+    return -(-word_count // _WORDS_PER_MINUTE)
+
+
+# Analysis request sent for each analyzed page. Kept free of indentation since
+# every leading space is a wasted prompt token.
+_ANALYSIS_PROMPT_TEMPLATE = (
+    "Analyzing the current webpage in reader mode: %(title)s\n"
+    "\n"
+    "Please provide a concise analysis including:\n"
+    "1. Summary of the main content (2-3 sentences)\n"
+    "2. Key topics covered\n"
+    "3. Objective assessment of information quality and reliability\n"
+    "4. Any potential biases or perspectives present\n"
+    "5. Context this content fits within\n"
+    "6. Key entities (people, organizations, products, locations)\n"
+    "7. Suggested keywords or tags for vector search indexing\n"
+    "\n"
+    "The last two items are important for search and retrieval purposes.\n"
+)
+
+# URL schemes analyze_content never extracts from
+_SKIPPED_SCHEMES = frozenset({'about', 'chrome', 'data'})
+
+# Cheap page fingerprint used as the extraction cache key. Counting elements
+# walks the tree once without serializing it to HTML.
+_FINGERPRINT_JS = "[location.href, document.getElementsByTagName('*').length]"
+
+# XPath builder shared by the other helpers, installed first as
+# window.__sage.getXPath
+_XPATH_JS = """
+window.__sage = window.__sage || {};
+(function() {
+    // 1-based position of an element among its same-tag siblings. Callers that
+    // build many paths pass an indexCache (a WeakMap), so the indexes for a
+    // parent are built once and shared by every XPath that passes through it.
+    function getSiblingIndex(element, indexCache) {
+        const parent = element.parentNode;
+        if (!parent) return 1;
+
+        if (!indexCache) {
+            let index = 1;
+            for (let sibling = element.previousElementSibling; sibling;
+                 sibling = sibling.previousElementSibling) {
+                if (sibling.tagName === element.tagName) index++;
+            }
+            return index;
+        }
+
+        let indexes = indexCache.get(parent);
+        if (!indexes) {
+            indexes = new Map();
+            const counts = new Map();
+            for (const child of parent.children) {
+                const count = (counts.get(child.tagName) || 0) + 1;
+                counts.set(child.tagName, count);
+                indexes.set(child, count);
+            }
+            indexCache.set(parent, indexes);
+        }
+        return indexes.get(element) || 1;
+    }
+
+    // XPath of an element, anchored at the nearest element (itself included)
+    // with an id or data-testid, and otherwise at the body. The walk stops at
+    // the first anchor, so ancestors above it are never visited. Values with a
+    // double quote can't sit inside the "..." literal and are not used as anchors.
+    function getXPath(element, indexCache) {
+        if (!element) return "/none";
+
+        let path = '';
+        let current = element;
+
+        while (current && current.nodeType === 1) {
+            const id = current.id;
+            if (id && !id.includes('"')) return `//*[@id="${id}"]${path}`;
+            const testId = current.getAttribute('data-testid');
+            if (testId && !testId.includes('"')) return `//*[@data-testid="${testId}"]${path}`;
+
+            const index = getSiblingIndex(current, indexCache);
+            const tagName = current.tagName.toLowerCase();
+            const pathIndex = (index > 1) ? `[${index}]` : '';
+            path = `/${tagName}${pathIndex}${path}`;
+
+            current = current.parentNode;
+            if (!current || current === document) break;
+            if (current.tagName === 'BODY') return `/html/body${path}`;
+        }
+
+        return path || "/unknown";
+    }
+
+    window.__sage.getXPath = getXPath;
+})();
+"""
+
+
+# Element lookup by CSS selector or XPath, installed as
+# window.__sage.querySelector
+_QUERY_JS = """
+window.__sage = window.__sage || {};
+(function() {
+    const ID_SELECTOR_RE = /^#([A-Za-z_][\\w-]*)$/;
+    const CLASS_SELECTOR_RE = /^\\.([A-Za-z_][\\w-]*)$/;
+    const TAG_SELECTOR_RE = /^[A-Za-z][\\w-]*$/;
+    // Paths such as /html/body/div, //*[@id="x"]/input, ./a or (//button)[2]
+    const XPATH_SELECTOR_RE = /^\\(*\\.{0,2}\\//;
+
+    // Same result as document.querySelector, but a bare #id, .class or tag name
+    // goes to the matching getElement* lookup and skips selector parsing.
+    // Other selectors, including invalid ones, go through querySelector.
+    // XPaths, such as the ones earlier results returned, are resolved natively.
+    function querySelector(selector) {
+        if (XPATH_SELECTOR_RE.test(selector)) {
+            return document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+
+        let match = ID_SELECTOR_RE.exec(selector);
+        if (match) return document.getElementById(match[1]);
+
+        match = CLASS_SELECTOR_RE.exec(selector);
+        if (match) return document.getElementsByClassName(match[1])[0] || null;
+
+        if (TAG_SELECTOR_RE.test(selector)) return document.getElementsByTagName(selector)[0] || null;
+
+        return document.querySelector(selector);
+    }
+
+    window.__sage.querySelector = querySelector;
+})();
+"""
+
+
+# Form field scanner shared by field detection and mapping. Installed next to the
+# extraction script and defines window.__sage.collectFields; XPaths and example
+# values are only computed when the caller asks for them.
+_FORM_FIELDS_JS = """
+window.__sage = window.__sage || {};
+window.__sage.collectFields = (function() {
+    // Helper function to check if element is visible. The cheap layout checks
+    // run first; display:none on the element or an ancestor already leaves it
+    // without an offsetParent, so computed style is only read for visibility.
+    function isVisible(element) {
+        if (!element || element.offsetParent === null) return false;
+        const rect = element.getBoundingClientRect();
+        if (rect.width === 0 || rect.height === 0) return false;
+        return window.getComputedStyle(element).visibility !== 'hidden';
+    }
+
+    // Get label text for a form field; labelsFor maps ids to their first label[for]
+    function getLabelText(element, labelsFor) {
+        // Check for label with 'for' attribute
+        if (element.id) {
+            const label = labelsFor.get(element.id);
+            if (label && label.textContent.trim()) {
+                return label.textContent.trim();
+            }
+        }
+
+        // Check for parent label
+        const parentLabel = element.closest('label');
+        if (parentLabel && parentLabel.textContent.trim()) {
+            // Remove the text of the input itself from the label text
+            const clone = parentLabel.cloneNode(true);
+            const inputs = clone.querySelectorAll('input, select, textarea');
+            inputs.forEach(input => input.remove());
+            return clone.textContent.trim();
+        }
+
+        // Look for nearby text that might serve as label
+        const parent = element.parentElement;
+        if (parent) {
+            // Check for text nodes or elements that might be labels
+            const possibleLabels = Array.from(parent.childNodes)
+                .filter(node => {
+                    return (node.nodeType === 3 && node.textContent.trim()) || // Text node
+                          (node.nodeType === 1 && 
+                           node !== element && 
+                           !['INPUT', 'SELECT', 'TEXTAREA', 'BUTTON'].includes(node.tagName) &&
+                           node.textContent.trim());
+                });
+
+            if (possibleLabels.length > 0) {
+                return possibleLabels[0].textContent.trim();
+            }
+        }
+
+        // Check for aria-label
+        if (element.getAttribute('aria-label')) {
+            return element.getAttribute('aria-label');
+        }
+
+        // Check for placeholder
+        if (element.getAttribute('placeholder')) {
+            return element.getAttribute('placeholder');
+        }
+
+        // Fallback to name or id
+        return element.name || element.id || "";
+    }
+
+    // Function to determine field type
+    function getFieldType(element) {
+        if (element.tagName === 'SELECT') {
+            return 'select';
+        }
+
+        if (element.tagName === 'TEXTAREA') {
+            return 'textarea';
+        }
+
+        if (element.tagName === 'INPUT') {
+            return element.type || 'text';
+        }
+
+        if (element.getAttribute('contenteditable') === 'true') {
+            return 'contenteditable';
+        }
+
+        return 'unknown';
+    }
+
+    // Example values for text fields, keyed by the first keyword found in the label
+    const LABEL_KIND_RE = /name|email|phone|address/;
+    const LABEL_EXAMPLES = {
+        name: "John Doe",
+        email: "example@email.com",
+        phone: "555-123-4567",
+        address: "123 Main Street"
+    };
+
+    // Example values for field types that don't depend on the label
+    const TYPE_EXAMPLES = {
+        checkbox: "true",
+        email: "example@email.com",
+        number: "42",
+        date: "2025-04-27"
+    };
+
+    // Function to get example value based on field type and label
+    function getExampleValue(field) {
+        const type = field.type;
+
+        // Based on field type and label, suggest appropriate values
+        if (type === 'text' || type === 'textarea') {
+            const label = (field.label || field.name || field.id || "").toLowerCase();
+            const kind = LABEL_KIND_RE.exec(label);
+            return kind ? LABEL_EXAMPLES[kind[0]] : "Sample text";
+        } else if (type === 'select') {
+            return field.options.length > 0 ? field.options[0].text : "Select an option";
+        } else if (type === 'radio') {
+            return field.radioOptions.length > 0 ? field.radioOptions[0].text : "Select an option";
+        }
+        return TYPE_EXAMPLES[type] || "Sample value";
+    }
+
+    function collectFields(options) {
+        const withXPath = !!(options && options.withXPath);
+
+        try {
+            // Index labels and radio groups once instead of querying per field
+            const labelsFor = new Map();
+            document.querySelectorAll('label[for]').forEach(label => {
+                if (!labelsFor.has(label.htmlFor)) labelsFor.set(label.htmlFor, label);
+            });
+
+            const radiosByName = new Map();
+            document.querySelectorAll('input[type="radio"]').forEach(radio => {
+                if (!radio.name) return;
+                const group = radiosByName.get(radio.name);
+                if (group) group.push(radio);
+                else radiosByName.set(radio.name, [radio]);
+            });
+            // Every radio in a group reports the same options, so build them once
+            const radioOptionsByName = new Map();
+            // Sibling indexes per parent, shared across XPaths
+            const indexCache = new WeakMap();
+
+            // Find all form fields
+            const formFields = [];
+            const inputElements = document.querySelectorAll('input:not([type="hidden"]), select, textarea, [contenteditable="true"]');
+
+            inputElements.forEach(element => {
+                if (!isVisible(element)) return;
+
+                const labelText = getLabelText(element, labelsFor);
+                const fieldType = getFieldType(element);
+                const required = element.required || element.getAttribute('aria-required') === 'true';
+
+                // Get options for select elements
+                let options = [];
+                if (element.tagName === 'SELECT') {
+                    options = Array.from(element.options).map(option => ({
+                        value: option.value,
+                        text: option.text
+                    }));
+                }
+
+                // Get radio button options if this is part of a radio group
+                let radioOptions = [];
+                if (fieldType === 'radio' && element.name) {
+                    const radioGroup = radiosByName.get(element.name) || [];
+                    if (radioGroup.length > 1) {
+                        radioOptions = radioOptionsByName.get(element.name);
+                        if (!radioOptions) {
+                            radioOptions = radioGroup.map(radio => {
+                                const radioLabel = getLabelText(radio, labelsFor);
+                                return {
+                                    value: radio.value,
+                                    text: radioLabel || radio.value
+                                };
+                            });
+                            radioOptionsByName.set(element.name, radioOptions);
+                        }
+                    }
+                }
+
+                // Filter out fields with no identification
+                if (labelText || element.name || element.id || element.placeholder) {
+                    const field = {
+                        label: labelText,
+                        name: element.name || "",
+                        id: element.id || "",
+                        type: fieldType,
+                        required: required,
+                        placeholder: element.placeholder || "",
+                        options: options,
+                        radioOptions: radioOptions,
+                        hasValue: element.value ? true : false,
+                        selector: element.id ? `#${CSS.escape(element.id)}` : 
+                                 element.name ? `[name="${CSS.escape(element.name)}"]` : null
+                    };
+
+                    // Mapping also wants an XPath and an example value per field
+                    if (withXPath) {
+                        field.xpath = window.__sage.getXPath(element, indexCache);
+                        field.example = getExampleValue(field);
+                    }
+
+                    formFields.push(field);
+                }
+            });
+
+            return { 
+                success: true, 
+                fields: formFields,
+                url: window.location.href,
+                title: document.title
+            };
+        } catch (e) {
+            return { 
+                success: false, 
+                message: `Error collecting form fields: ${e.message}` 
+            };
+        }
+    }
+
+    return collectFields;
+})();
+"""
+
+
+# Fills fields located by XPath. Installed next to the other helpers as
+# window.__sage.fillByXPath and window.__sage.fillByXPathBatch, so a fill only
+# sends the xpaths and values.
+_FILL_BY_XPATH_JS = """
+window.__sage = window.__sage || {};
+(function() {
+    // Events fired after a fill. An event can be dispatched again once its
+    // previous dispatch has finished, so the same instances are reused.
+    const INPUT_EVENT = new Event('input', { bubbles: true });
+    const CHANGE_EVENT = new Event('change', { bubbles: true });
+    const BLUR_EVENT = new Event('blur', { bubbles: true });
+
+    // Values that check or uncheck a checkbox, the same ones fillForm accepts
+    const TRUE_SET = new Set(['true', 'yes', 'checked', 'on', '1']);
+    const FALSE_SET = new Set(['false', 'no', 'unchecked', 'off', '0']);
+
+    // Elements already resolved by XPath. Any change to the document's structure
+    // may move an XPath to another element, so the first mutation after an entry
+    // is cached clears the cache and stops watching until it is used again.
+    const xpathCache = new Map();
+    const xpathObserver = new MutationObserver(() => {
+        xpathCache.clear();
+        xpathObserver.disconnect();
+    });
+
+    // XPaths of the form //tag[@id="x"] or //tag[@name="x"], which map straight
+    // onto getElementById / querySelector without the XPath engine
+    const SIMPLE_XPATH_RE = /^\\/\\/(\\*|[a-zA-Z][\\w-]*)\\[@(id|name)=(["'])([^"']*)\\3\\]$/;
+
+    function resolveXPath(xpath) {
+        const simple = SIMPLE_XPATH_RE.exec(xpath);
+        if (simple) {
+            const [, tag, attr, , value] = simple;
+            if (tag === '*' && attr === 'id') return document.getElementById(value);
+            return document.querySelector(`${tag === '*' ? '' : tag}[${attr}="${CSS.escape(value)}"]`);
+        }
+        return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+
+    // Find the element by XPath
+    function getElementByXPath(xpath) {
+        let element = xpathCache.get(xpath);
+        if (element && element.isConnected) return element;
+
+        element = resolveXPath(xpath);
+        if (element) {
+            if (!xpathCache.size) {
+                xpathObserver.observe(document.documentElement, { childList: true, subtree: true });
+            }
+            xpathCache.set(xpath, element);
+        }
+        return element;
+    }
+
+    // Which fill branch an element takes
+    function getFieldKind(element) {
+        if (element.tagName === 'SELECT') return 'select';
+        const type = element.type;
+        const role = element.getAttribute('role');
+        if (type === 'checkbox' || role === 'checkbox') return 'checkbox';
+        if (type === 'radio' || role === 'radio') return 'radio';
+        return 'text';
+    }
+
+    function fillByXPath(xpath, value) {
+        try {
+            // Get the element
+            const element = getElementByXPath(xpath);
+            if (!element) {
+                return { success: false, missing: true, message: `Element not found by XPath: ${xpath}` };
+            }
+
+            // Focus the element
+            element.focus();
+
+            // Lowercased once for all the comparisons below
+            const valueLower = value.toLowerCase();
+
+            // Handle different element types
+            switch (getFieldKind(element)) {
+                case 'select': {
+                    // Handle select dropdowns. One pass picks the best option: a
+                    // matching value, then matching text, then text containing it.
+                    let bestOption = null;
+                    let bestScore = 0;
+
+                    for (const option of element.options) {
+                        if (option.value.toLowerCase() === valueLower) {
+                            bestOption = option;
+                            break;
+                        }
+                        const text = option.text.toLowerCase();
+                        const score = text === valueLower ? 2 : text.includes(valueLower) ? 1 : 0;
+                        if (score > bestScore) {
+                            bestOption = option;
+                            bestScore = score;
+                        }
+                    }
+
+                    if (bestOption) {
+                        element.value = bestOption.value;
+                    } else {
+                        return { success: false, message: `Option '${value}' not found in dropdown` };
+                    }
+                    break;
+                }
+                case 'checkbox': {
+                    // Handle checkboxes
+                    if (TRUE_SET.has(valueLower)) {
+                        if (!element.checked) {
+                            element.click();
+                        }
+                    } else if (FALSE_SET.has(valueLower)) {
+                        if (element.checked) {
+                            element.click();
+                        }
+                    } else {
+                        element.click();
+                    }
+                    break;
+                }
+                case 'radio': {
+                    // Simply click radio buttons
+                    element.click();
+                    break;
+                }
+                default: {
+                    // Handle text inputs. The single input event below reports the
+                    // final value, so no events are fired for intermediate states.
+                    if (element.value !== undefined) {
+                        element.value = value;
+                    }
+                    else if (element.getAttribute('contenteditable') === 'true') {
+                        // Handle contenteditable
+                        element.textContent = value;
+                    }
+                }
+            }
+
+            // Dispatch events, each once
+            if (element.tagName !== 'SELECT') {
+                element.dispatchEvent(INPUT_EVENT);
+            }
+
+            element.dispatchEvent(CHANGE_EVENT);
+            element.dispatchEvent(BLUR_EVENT);
+
+            return { 
+                success: true, 
+                xpath: xpath,
+                value: value
+            };
+        } catch (e) {
+            return { 
+                success: false, 
+                message: `Error filling by XPath: ${e.message}`,
+                xpath: xpath
+            };
+        }
+    }
+
+    // Fill every [xpath, value] pair in one call, one result per pair
+    function fillByXPathBatch(entries) {
+        return entries.map(([xpath, value]) => fillByXPath(xpath, value));
+    }
+
+    window.__sage.fillByXPath = fillByXPath;
+    window.__sage.fillByXPathBatch = fillByXPathBatch;
+})();
+"""
+
+
+# Label-driven form filler. Installed next to the other helpers as
+# window.__sage.fillForm; it takes every [field, value] pair at once so the
+# page-wide scans are shared by the whole batch.
+_FILL_FORM_JS = """
+window.__sage = window.__sage || {};
+(function() {
+    // Events fired after each field is filled, reused across fields
+    const INPUT_EVENT = new Event('input', { bubbles: true });
+    const CHANGE_EVENT = new Event('change', { bubbles: true });
+    const BLUR_EVENT = new Event('blur', { bubbles: true });
+
+    // Field names that suggest a yes/no or multiple choice answer
+    const BOOLEAN_FIELD_RE = /yes|no|agree|disagree|accept|true|false/i;
+    const HEADING_RE = /^H[1-6]$/;
+
+    // checkVisibility() options, under both their current and original names
+    const VISIBILITY_OPTIONS = {
+        opacityProperty: true, visibilityProperty: true,
+        checkOpacity: true, checkVisibilityCSS: true
+    };
+
+    // Values that check or uncheck a checkbox
+    const TRUE_SET = new Set(['true', 'yes', 'checked', 'on', '1']);
+    const FALSE_SET = new Set(['false', 'no', 'unchecked', 'off', '0']);
+
+    // Selectors shared by the strategies below
+    const TEXT_SELECTOR = 'label, h1, h2, h3, h4, h5, h6, p, span, div, legend, [role="heading"]';
+    const HEADING_SELECTOR = '.M7eMe, [role="heading"], .freebirdFormviewerViewItemsItemItemTitle, h1, h2, h3, h4, h5';
+    const FIELD_SELECTOR = 'input, textarea, select, [role="radio"], [role="checkbox"], [contenteditable="true"]';
+    const GOOGLE_INPUT_SELECTOR = '.whsOnd, .rFrNMe input, [role="radio"], [role="checkbox"]';
+    const PLAIN_INPUT_SELECTOR = 'input, textarea, select';
+    // Tags the positional fallback reads field names from
+    const POSITIONAL_TEXT_TAGS = new Set(['LABEL', 'H1', 'H2', 'H3', 'H4', 'H5', 'H6',
+                                          'P', 'SPAN', 'DIV', 'LEGEND']);
+
+    // querySelectorAll remembered per selector and root for the rest of the
+    // batch, so sections and containers shared by several fields are queried once
+    function queryAll(cache, root, selector) {
+        let results = cache.queries.get(selector);
+        if (!results) {
+            results = new WeakMap();
+            cache.queries.set(selector, results);
+        }
+        let list = results.get(root);
+        if (!list) {
+            list = root.querySelectorAll(selector);
+            results.set(root, list);
+        }
+        return list;
+    }
+
+    // Visibility results and bounding rects remembered while one field is being
+    // located, since the strategies below inspect the same elements repeatedly
+    let visibilityMemo = null;
+    let rectMemo = null;
+
+    function getRect(element) {
+        if (!rectMemo) return element.getBoundingClientRect();
+        let rect = rectMemo.get(element);
+        if (!rect) {
+            rect = element.getBoundingClientRect();
+            rectMemo.set(element, rect);
+        }
+        return rect;
+    }
+
+    // Universal form field finder with improved accuracy. The cache holds the
+    // element lists shared by every field in a batch.
+    function findFormField(fieldText, cache) {
+        // Only the best candidate is kept; earlier candidates win ties
+        let bestMatch = null;
+        let bestScore = 0;
+        function addMatch(match) {
+            if (match.score > bestScore) {
+                bestMatch = match;
+                bestScore = match.score;
+            }
+        }
+
+        const fieldLower = fieldText.toLowerCase();
+        const isBooleanField = BOOLEAN_FIELD_RE.test(fieldLower);
+
+        // STRATEGY 1: Find by exact field label match
+        // Once a 99 is found only an exact label with a 'for' target can still
+        // improve on it, so everything else is skipped from then on.
+        const textElements = queryAll(cache, document, TEXT_SELECTOR);
+        for (const el of textElements) {
+            if (bestScore >= 99 && !(el.tagName === 'LABEL' && el.htmlFor)) continue;
+
+            // Skip invisible elements
+            if (!isVisible(el)) continue;
+
+            // Check for EXACT matches first (highest priority)
+            const trimmedContent = el.textContent.trim();
+            if (trimmedContent.toLowerCase() === fieldLower) {
+                // We found an exact match! Now find its input
+
+                // If it's a label with 'for' attribute
+                if (el.tagName === 'LABEL' && el.htmlFor) {
+                    const input = document.getElementById(el.htmlFor);
+                    if (input && isInputElement(input)) {
+                        // Exact match is so good we can return immediately
+                        return { element: input, method: 'exact_label_match', score: 100 };
+                    }
+                }
+
+                if (bestScore >= 99) continue;
+
+                // Look for input in the same section
+                const section = findCommonContainer(el, cache);
+                if (section) {
+                    const inputs = queryAll(cache, section, FIELD_SELECTOR);
+                    if (inputs.length > 0) {
+                        // If there's only one input, it's almost certainly the right one
+                        if (inputs.length === 1) {
+                            addMatch({ element: inputs[0], method: 'exact_text_match_single_input', score: 99 });
+                        } else {
+                            // Multiple inputs, find closest one that's not a radio/checkbox
+                            // or take first input as fallback
+                            const textInputs = Array.from(inputs).filter(input => 
+                                !['radio', 'checkbox'].includes(input.type) && 
+                                input.getAttribute('role') !== 'radio' &&
+                                input.getAttribute('role') !== 'checkbox');
+
+                            if (textInputs.length > 0) {
+                                const closestInput = textInputs[0]; // First is often correct in forms
+                                addMatch({ element: closestInput, method: 'exact_text_match_multi_input', score: 95 });
+                            } else {
+                                addMatch({ element: inputs[0], method: 'exact_text_match_fallback', score: 90 });
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+        // STRATEGY 2: Find field by visual proximity to matching label text
+        // This is crucial for finding fields in complex forms. Each strategy stops
+        // as soon as nothing it could find would beat the current best.
+        for (const el of textElements) {
+            if (bestScore > 90) break;
+            if (!isVisible(el)) continue;
+
+            // Check for containing matches
+            const trimmedContent = el.textContent.trim();
+            if (trimmedContent.toLowerCase().includes(fieldLower) && 
+                bestScore <= 90) { // Skip if we already have very good matches
+
+                // Check if this is a heading element
+                const isHeading = HEADING_RE.test(el.tagName) || 
+                                 el.getAttribute('role') === 'heading' ||
+                                 window.getComputedStyle(el).fontWeight >= 600;
+
+                // Find the form section containing this label
+                const section = findCommonContainer(el, cache);
+                if (section) {
+                    // Get all inputs within this section
+                    const allInputs = queryAll(cache, section, FIELD_SELECTOR);
+
+                    if (allInputs.length > 0) {
+                        // Calculate visual position of the label
+                        const labelRect = getRect(el);
+
+                        // Get inputs positioned below this label (form fields are typically below labels)
+                        // or get all inputs if no inputs found below
+                        let relevantInputs = Array.from(allInputs).filter(input => {
+                            const inputRect = getRect(input);
+                            return inputRect.top >= labelRect.bottom || // input is below label
+                                   (inputRect.bottom >= labelRect.top && inputRect.top <= labelRect.bottom); // input overlaps label
+                        });
+
+                        // If no inputs found below, consider all inputs in the section
+                        if (relevantInputs.length === 0) {
+                            relevantInputs = Array.from(allInputs);
+                        }
+
+                        // Filter out hidden inputs
+                        relevantInputs = relevantInputs.filter(input => isVisible(input));
+
+                        if (relevantInputs.length > 0) {
+                            // If there's only one input, it's very likely the correct field
+                            if (relevantInputs.length === 1) {
+                                const score = isHeading ? 94 : 88; // Headings are more reliable
+                                addMatch({ 
+                                    element: relevantInputs[0], 
+                                    method: 'single_field_section', 
+                                    score: score
+                                });
+                            }
+                            // For multiple inputs, find the closest one vertically and horizontally
+                            else {
+                                // Score each input by its position relative to the label
+                                const scoredInputs = relevantInputs.map(input => {
+                                    const inputRect = getRect(input);
+
+                                    // Calculate vertical and horizontal distance
+                                    const verticalDist = Math.abs(inputRect.top - labelRect.bottom);
+                                    const horizontalOverlap = Math.max(0, 
+                                        Math.min(inputRect.right, labelRect.right) - 
+                                        Math.max(inputRect.left, labelRect.left)
+                                    );
+
+                                    // Check if input is a text field (preferred over radio/checkbox)
+                                    const isTextField = input.tagName === 'INPUT' && 
+                                                      !['radio', 'checkbox'].includes(input.type);
+
+                                    // Calculate score based on positioning and input type
+                                    // Lower vertical distance is better, horizontal overlap is good
+                                    let posScore = (1000 - verticalDist) + (horizontalOverlap > 0 ? 200 : 0);
+
+                                    // Prefer text fields to radio/checkbox for most field names
+                                    // Unless the field name suggests boolean/multiple choice
+                                    if (isTextField && !isBooleanField) posScore += 300;
+
+                                    return { input, posScore };
+                                });
+
+                                // Sort by score
+                                scoredInputs.sort((a, b) => b.posScore - a.posScore);
+
+                                // Take the best match
+                                if (scoredInputs.length > 0) {
+                                    const bestInput = scoredInputs[0].input;
+                                    const score = isHeading ? 92 : 86; // Headings are more reliable
+                                    addMatch({ 
+                                        element: bestInput, 
+                                        method: 'positioned_field', 
+                                        score: score
+                                    });
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+        // STRATEGY 3: Find field by direct selectors (ID, name, placeholder)
+        // This works well for properly semantic forms
+        const fieldEscaped = CSS.escape(fieldText);
+        const idSelector = `#${fieldEscaped}`;
+        const directSelectors = [
+            // Exact matches
+            idSelector,                                // id exactly matches
+            `[name="${fieldEscaped}"]`,                // name exactly matches
+            `[placeholder="${fieldEscaped}"]`,         // placeholder exactly matches
+            `[aria-label="${fieldEscaped}"]`,          // aria-label exactly matches
+
+            // Contains matches (case insensitive)
+            `[id*="${fieldEscaped}" i]`,               // id contains
+            `[name*="${fieldEscaped}" i]`,             // name contains
+            `input[placeholder*="${fieldEscaped}" i]`, // placeholder contains
+            `[aria-label*="${fieldEscaped}" i]`        // aria-label contains
+        ];
+
+        for (const selector of directSelectors) {
+            if (bestScore >= 98) break;
+            try {
+                const element = document.querySelector(selector);
+                if (element && isInputElement(element) && isVisible(element)) {
+                    // Determine score based on match type
+                    let score = 85;
+                    if (selector.includes('*=')) {
+                        score = 75; // Partial matches are less reliable
+                    }
+
+                    // Exact ID match is very reliable
+                    if (selector === idSelector) score = 98;
+
+                    addMatch({ element, method: 'direct_selector', score: score });
+                }
+            } catch (e) {
+                // Invalid selector, continue
+            }
+        }
+
+        // STRATEGY 4: Special case for complex forms like Google Forms
+        // Look for headings/questions and their associated inputs
+        const allHeadings = queryAll(cache, document, HEADING_SELECTOR);
+        for (const heading of allHeadings) {
+            if (bestScore >= 96) break;
+            if (!isVisible(heading)) continue;
+
+            const headingText = heading.textContent.trim();
+            if (headingText.toLowerCase().includes(fieldLower)) {
+                // For Google Forms, we need to find the container with the input
+                let container = heading;
+                while (container && 
+                       !container.classList.contains('Qr7Oae') &&
+                       !container.classList.contains('freebirdFormviewerViewItemsItemItem') &&
+                       container.tagName !== 'BODY') {
+                    container = container.parentElement;
+                }
+
+                if (container) {
+                    // Google Form inputs often have these classes
+                    const googleInputs = queryAll(cache, container, GOOGLE_INPUT_SELECTOR);
+
+                    if (googleInputs.length > 0) {
+                        // Prefer text inputs unless field suggests radio/checkbox
+                        let bestInput;
+                        if (isBooleanField) {
+                            // For boolean fields, prefer radio/checkboxes
+                            bestInput = Array.from(googleInputs).find(el => 
+                                el.type === 'radio' || 
+                                el.type === 'checkbox' || 
+                                el.getAttribute('role') === 'radio' ||
+                                el.getAttribute('role') === 'checkbox'
+                            ) || googleInputs[0];
+                        } else {
+                            // For text fields, prefer text inputs
+                            bestInput = Array.from(googleInputs).find(el => 
+                                el.type === 'text' || 
+                                el.type === 'email' || 
+                                el.tagName === 'TEXTAREA'
+                            ) || googleInputs[0];
+                        }
+
+                        addMatch({ 
+                            element: bestInput, 
+                            method: 'google_form_pattern', 
+                            score: 96  // Very reliable for Google Forms
+                        });
+                    }
+                }
+            }
+        }
+
+        // STRATEGY 5: Positional strategy for forms with no labels
+        // This is a last resort for poorly designed forms
+        if (!bestMatch) {
+            // Create a simple mapping of input positions to potential field names
+            const fieldNames = extractPotentialFieldNames(cache);
+
+            // Find field index
+            const fieldIndex = fieldNames.findIndex(name => name.includes(fieldLower));
+
+            // Only the visible inputs up to that position are needed
+            if (fieldIndex >= 0) {
+                let position = -1;
+                for (const input of queryAll(cache, document, PLAIN_INPUT_SELECTOR)) {
+                    if (isVisible(input) && ++position === fieldIndex) {
+                        addMatch({ 
+                            element: input, 
+                            method: 'positional', 
+                            score: 60  // Low confidence
+                        });
+                        break;
+                    }
+                }
+            }
+        }
+
+        // Return best match
+        return bestMatch || { element: null, method: 'none', score: 0 };
+    }
+
+    // Extract potential field names (lowercased) from visible text. Reuses the
+    // text element list from strategy 1, minus the elements that are only there
+    // for their heading role, and is built once per batch.
+    function extractPotentialFieldNames(cache) {
+        if (cache.potentialFieldNames) return cache.potentialFieldNames;
+
+        const potentialLabels = [];
+        for (const el of queryAll(cache, document, TEXT_SELECTOR)) {
+            if (!POSITIONAL_TEXT_TAGS.has(el.tagName) || !isVisible(el)) continue;
+
+            const text = el.textContent.trim();
+            if (text) {
+                potentialLabels.push(text.toLowerCase());
+            }
+        }
+
+        cache.potentialFieldNames = potentialLabels;
+        return potentialLabels;
+    }
+
+    // Every element that has a descendant matching selector. Built on first use
+    // and kept in the batch cache, so container checks become set lookups
+    // instead of a querySelector per ancestor.
+    function getInputAncestors(cache, selector) {
+        let ancestors = cache.inputAncestors.get(selector);
+        if (!ancestors) {
+            ancestors = new Set();
+            for (const input of document.querySelectorAll(selector)) {
+                for (let node = input.parentElement; node && !ancestors.has(node); node = node.parentElement) {
+                    ancestors.add(node);
+                }
+            }
+            cache.inputAncestors.set(selector, ancestors);
+        }
+        return ancestors;
+    }
+
+    // Find the common container for a form element
+    function findCommonContainer(element, cache) {
+        let current = element;
+
+        // First look for standard form containers
+        while (current && current.tagName !== 'BODY') {
+            // Standard form containers
+            if (current.tagName === 'FORM' || 
+                current.tagName === 'FIELDSET' ||
+                current.classList.contains('form-group') ||
+                current.classList.contains('form-field') ||
+                current.classList.contains('field-container') ||
+                current.classList.contains('input-group') ||
+                current.getAttribute('role') === 'group') {
+                return current;
+            }
+
+            // Google Forms specific containers
+            if (current.classList.contains('Qr7Oae') ||
+                current.classList.contains('freebirdFormviewerViewItemsItemItem') ||
+                current.classList.contains('geS5n')) {
+                return current;
+            }
+
+            // Look for any container with both text and input
+            if (current.children.length < 15 &&
+                getInputAncestors(cache, 'input, textarea, select, [role="radio"]').has(current) &&
+                current.textContent.trim()) {
+                return current;
+            }
+
+            current = current.parentElement;
+        }
+
+        // Fallback to nearest common container with other inputs
+        const fieldAncestors = getInputAncestors(cache, PLAIN_INPUT_SELECTOR);
+        current = element;
+        while (current && current.tagName !== 'BODY') {
+            if (fieldAncestors.has(current)) {
+                return current;
+            }
+
+            current = current.parentElement;
+        }
+
+        return element.parentElement;
+    }
+
+    // Check if element is a valid input element
+    function isInputElement(element) {
+        if (!element) return false;
+
+        // Standard form inputs
+        if (element.tagName === 'INPUT' || 
+            element.tagName === 'TEXTAREA' || 
+            element.tagName === 'SELECT') return true;
+
+        // ARIA roles
+        const role = element.getAttribute('role');
+        if (role === 'textbox' || role === 'combobox' || 
+            role === 'radio' || role === 'checkbox') return true;
+
+        // Contenteditable
+        if (element.getAttribute('contenteditable') === 'true') return true;
+
+        return false;
+    }
+
+    // Check if element is visible
+    function isVisible(element) {
+        if (!element) return false;
+        if (visibilityMemo) {
+            let visible = visibilityMemo.get(element);
+            if (visible === undefined) {
+                visible = checkVisible(element);
+                visibilityMemo.set(element, visible);
+            }
+            return visible;
+        }
+        return checkVisible(element);
+    }
+
+    function checkVisible(element) {
+        // Let the engine check display, visibility and opacity natively where it
+        // can, falling back to the computed style
+        if (element.checkVisibility) {
+            if (!element.checkVisibility(VISIBILITY_OPTIONS)) return false;
+        } else {
+            const style = window.getComputedStyle(element);
+            if (style.display === 'none' || 
+                style.visibility === 'hidden' || 
+                style.opacity === '0') {
+                return false;
+            }
+        }
+
+        // Check dimensions
+        const rect = getRect(element);
+        if (rect.width === 0 || rect.height === 0) {
+            return false;
+        }
+
+        return true;
+    }
+
+    // Which fill branch an element takes
+    function getFieldKind(element) {
+        if (element.tagName === 'SELECT') return 'select';
+        const type = element.type;
+        const role = element.getAttribute('role');
+        if (type === 'checkbox' || role === 'checkbox') return 'checkbox';
+        if (type === 'radio' || role === 'radio') return 'radio';
+        return 'text';
+    }
+
+    // Label associated with a radio, looked up once per fill
+    function labelFor(radio, cache) {
+        let label = cache.labels.get(radio);
+        if (label === undefined) {
+            label = radio.id
+                ? document.querySelector(`label[for="${CSS.escape(radio.id)}"]`)
+                : radio.closest('label');
+            cache.labels.set(radio, label);
+        }
+        return label;
+    }
+
+    // Lowercased text of an element, serialized once per fill
+    function lowerText(element, cache) {
+        let text = cache.texts.get(element);
+        if (text === undefined) {
+            text = element.textContent.toLowerCase();
+            cache.texts.set(element, text);
+        }
+        return text;
+    }
+
+    // Google Forms container wrapping a radio and its text. Found by walking up
+    // and testing class names directly, without going through the selector engine.
+    function containerFor(radio, cache) {
+        let container = cache.containers.get(radio);
+        if (container === undefined) {
+            container = radio;
+            while (container && !(container.classList.contains('nWQGrd') ||
+                                  container.classList.contains('docssharedWizToggleLabeledContainer'))) {
+                container = container.parentElement;
+            }
+            cache.containers.set(radio, container);
+        }
+        return container;
+    }
+
+    // Locate one field and fill it with value
+    function fillField(field, value, cache) {
+        // Find the element
+        const result = findFormField(field, cache);
+        if (!result.element) {
+            return { success: false, message: `Could not find field: ${field}`, field: field };
+        }
+
+        // Reported back so later fills of this field can go straight to it. Not
+        // for radios: the element found is one option of the group, and which
+        // option gets clicked depends on the value being filled.
+        const kind = getFieldKind(result.element);
+        const xpath = kind === 'radio' ? null : window.__sage.getXPath(result.element);
+
+        // Make element visible and in view
+        if (result.element.scrollIntoView) {
+            result.element.scrollIntoView({ behavior: 'auto', block: 'center' });
+        }
+
+        // Focus and click the element
+        result.element.focus();
+
+        try {
+            // Handle different element types
+            const element = result.element;
+            const valueLower = value.toLowerCase();
+
+            switch (kind) {
+                case 'select': {
+                    // Handle select dropdowns. One pass picks the best option: a
+                    // matching value, then matching text, then text containing it.
+                    let bestOption = null;
+                    let bestScore = 0;
+
+                    for (const option of element.options) {
+                        if (option.value.toLowerCase() === valueLower) {
+                            bestOption = option;
+                            break;
+                        }
+                        const text = option.text.toLowerCase();
+                        const score = text === valueLower ? 2 : text.includes(valueLower) ? 1 : 0;
+                        if (score > bestScore) {
+                            bestOption = option;
+                            bestScore = score;
+                        }
+                    }
+
+                    if (bestOption) {
+                        element.value = bestOption.value;
+                    } else {
+                        return { success: false, message: `Option '${value}' not found in dropdown` };
+                    }
+                    break;
+                }
+                case 'checkbox': {
+                    // Handle checkboxes
+                    if (TRUE_SET.has(valueLower)) {
+                        // Check the box if not already checked
+                        if (!element.checked) {
+                            element.click();
+                        }
+                    } else if (FALSE_SET.has(valueLower)) {
+                        // Uncheck the box if checked
+                        if (element.checked) {
+                            element.click();
+                        }
+                    } else {
+                        // Default to clicking
+                        element.click();
+                    }
+                    break;
+                }
+                case 'radio': {
+                    // For radio buttons, we need to handle group behavior
+                    // Try to find all radios in the same group
+                    let radioGroup;
+                    const name = element.name;
+
+                    if (name) {
+                        // Find all radios with the same name
+                        radioGroup = document.querySelectorAll(`input[name="${CSS.escape(name)}"]`);
+                    } else if (element.getAttribute('role') === 'radio') {
+                        // Find all radio roles in the same container
+                        let container = element.closest('[role="radiogroup"]') || 
+                                       element.closest('.Qr7Oae') || 
+                                       element.closest('form') || 
+                                       document;
+                        radioGroup = container.querySelectorAll('[role="radio"]');
+                    } else {
+                        // Just click this specific radio
+                        element.click();
+                        radioGroup = [element];
+                    }
+
+                    // If we want a specific value and have multiple radios
+                    if (radioGroup.length > 1 && value && 
+                        valueLower !== 'true' && 
+                        valueLower !== 'yes') {
+
+                        let foundMatch = false;
+
+                        // Try to find radio by value, label, or aria-label
+                        for (const radio of radioGroup) {
+                            // Check radio value
+                            if (radio.value && radio.value.toLowerCase() === valueLower) {
+                                radio.click();
+                                foundMatch = true;
+                                break;
+                            }
+
+                            // Check associated label, or else a nearby one
+                            let label = labelFor(radio, cache);
+                            if (!label && !radio.id && radio.parentElement) {
+                                label = Array.from(radio.parentElement.querySelectorAll('label')).find(l => 
+                                    lowerText(l, cache).includes(valueLower));
+                            }
+
+                            if (label && lowerText(label, cache).includes(valueLower)) {
+                                radio.click();
+                                foundMatch = true;
+                                break;
+                            }
+
+                            // Try to find by nearby text (Google Forms pattern)
+                            const container = containerFor(radio, cache);
+                            if (container) {
+                                const text = lowerText(container, cache);
+                                if (text.includes(valueLower)) {
+                                    radio.click();
+                                    foundMatch = true;
+                                    break;
+                                }
+                            }
+                        }
+
+                        if (!foundMatch) {
+                            // Default to the first radio if we couldn't find a match
+                            radioGroup[0].click();
+                        }
+                    } else {
+                        // Default selection - just click this radio
+                        element.click();
+                    }
+                    break;
+                }
+                default: {
+                    // Handle text inputs. The single input event below reports the
+                    // final value, so no events are fired for intermediate states.
+                    if (element.value !== undefined) {
+                        element.value = value;
+                    }
+                    else if (element.getAttribute('contenteditable') === 'true') {
+                        // Handle contenteditable
+                        element.textContent = value;
+                    }
+                }
+            }
+
+            // Final events for all field types, each fired once
+            if (element.tagName !== 'SELECT') {
+                element.dispatchEvent(INPUT_EVENT);
+            }
+
+            element.dispatchEvent(CHANGE_EVENT);
+            element.dispatchEvent(BLUR_EVENT);
+
+            return { 
+                success: true, 
+                field: field,
+                method: result.method,
+                score: result.score,
+                xpath: xpath,
+                value: value
+            };
+        } catch (e) {
+            return { 
+                success: false, 
+                message: `Error filling field: ${e.message}`,
+                field: field
+            };
+        }
+    }
+
+    // Fill every [field, value] pair in one call, one result per pair. Element
+    // lists are collected once and shared by all the fields.
+    function fillForm(entries) {
+        const cache = {
+            queries: new Map(),
+            inputAncestors: new Map(),
+            potentialFieldNames: null,
+            labels: new WeakMap(),
+            containers: new WeakMap(),
+            texts: new WeakMap()
+        };
+
+        return entries.map(([field, value]) => {
+            // Filling a field can show, hide or scroll others, so layout is only
+            // remembered while locating a single field
+            visibilityMemo = new WeakMap();
+            rectMemo = new WeakMap();
+            try {
+                return fillField(field, value, cache);
+            } catch (e) {
+                return { 
+                    success: false, 
+                    message: `Error filling field: ${e.message}`,
+                    field: field
+                };
+            } finally {
+                visibilityMemo = null;
+                rectMemo = null;
+            }
+        });
+    }
+
+    window.__sage.fillForm = fillForm;
+})();
+"""
+
+
+# Selects an option in a dropdown, installed as window.__sage.selectOption
+_SELECT_OPTION_JS = """
+window.__sage = window.__sage || {};
+(function() {
+    // Selectors that could also be a bare element id
+    const ID_LIKE_RE = /^[A-Za-z_][\\w-]*$/;
+
+    // Helper function to find elements by various attributes
+    function findElement(selector) {
+        // Try by ID first when the selector looks like one, skipping selector parsing
+        const idLike = ID_LIKE_RE.test(selector);
+        if (idLike) {
+            const elementById = document.getElementById(selector);
+            if (elementById) return { element: elementById, method: 'id' };
+        }
+
+        // Try direct CSS selector
+        try {
+            const element = document.querySelector(selector);
+            if (element) return { element, method: 'css_selector' };
+        } catch (e) {
+            // Invalid selector, continue with other methods
+        }
+
+        // Try by ID
+        if (!idLike) {
+            const elementById = document.getElementById(selector);
+            if (elementById) return { element: elementById, method: 'id' };
+        }
+
+        // Try by name attribute
+        const elementByName = document.getElementsByName(selector)[0];
+        if (elementByName) return { element: elementByName, method: 'name' };
+
+        // Try by label text
+        const selectorLower = selector.toLowerCase();
+        for (const label of document.getElementsByTagName('label')) {
+            if (label.htmlFor && label.textContent.toLowerCase().includes(selectorLower)) {
+                const elementByLabel = document.getElementById(label.htmlFor);
+                if (elementByLabel) return { element: elementByLabel, method: 'label' };
+            }
+        }
+
+        // Try by placeholder
+        const elementByPlaceholder = document.querySelector(`[placeholder*="${CSS.escape(selector)}" i]`);
+        if (elementByPlaceholder) return { element: elementByPlaceholder, method: 'placeholder' };
+
+        return { element: null, method: 'none' };
+    }
+
+    function selectOption(selector, value) {
+        try {
+            // Find the select element
+            const result = findElement(selector);
+            if (!result.element || result.element.tagName !== 'SELECT') {
+                return { 
+                    success: false, 
+                    message: `Could not find select element with selector: ${selector}`
+                };
+            }
+
+            const select = result.element;
+            const xpath = window.__sage.getXPath(select);
+            let optionFound = false;
+            let selectedText = '';
+
+            // Try to find the option by value, text content, or index
+            if (value.match(/^\\d+$/)) {
+                // If value is a number, try to select by index
+                const index = parseInt(value);
+                if (index >= 0 && index < select.options.length) {
+                    select.selectedIndex = index;
+                    optionFound = true;
+                    selectedText = select.options[index].text;
+                }
+            }
+
+            // If not found by index or value is not a number, pick the best option
+            // in one pass: exact value, then case-insensitive text, then text
+            // containing the value
+            if (!optionFound) {
+                const valueLower = value.toLowerCase();
+                let best = -1;
+                let bestScore = 0;
+
+                for (let i = 0; i < select.options.length; i++) {
+                    const option = select.options[i];
+
+                    // Try exact value match
+                    if (option.value === value) {
+                        best = i;
+                        break;
+                    }
+
+                    const text = option.text.toLowerCase();
+                    const score = text === valueLower ? 2 : text.includes(valueLower) ? 1 : 0;
+                    if (score > bestScore) {
+                        best = i;
+                        bestScore = score;
+                    }
+                }
+
+                if (best >= 0) {
+                    select.selectedIndex = best;
+                    optionFound = true;
+                    selectedText = select.options[best].text;
+                }
+            }
+
+            // Dispatch change event
+            if (optionFound) {
+                select.dispatchEvent(new Event('change', { bubbles: true }));
+                return { 
+                    success: true, 
+                    method: result.method,
+                    xpath: xpath,
+                    selectedText: selectedText,
+                    selectedValue: select.value
+                };
+            }
+
+            return { 
+                success: false, 
+                message: `Option "${value}" not found in select element` 
+            };
+        } catch (e) {
+            return {
+                success: false,
+                message: `Error selecting option: ${e.message}`
+            };
+        }
+    }
+
+    window.__sage.selectOption = selectOption;
+})();
+"""
+
+
+# Selects a radio button by its question text and option, installed as
+# window.__sage.checkRadio
+_CHECK_RADIO_JS = """
+window.__sage = window.__sage || {};
+(function() {
+    // Elements that may hold the text of a question
+    const QUESTION_TAGS = new Set(['H1', 'H2', 'H3', 'H4', 'H5', 'H6', 'LEGEND', 'LABEL', 'P', 'SPAN', 'DIV']);
+
+    // checkVisibility() options, under both their current and original names
+    const VISIBILITY_OPTIONS = { visibilityProperty: true, checkVisibilityCSS: true };
+
+    // Visibility results and radio labels remembered during one call, since the
+    // strategies below inspect the same elements repeatedly
+    let visibilityMemo = null;
+    let labelMemo = null;
+    let textMemo = null;
+
+    // Helper function to check if an element is visible
+    function isVisible(element) {
+        if (!element) return false;
+        if (visibilityMemo) {
+            let visible = visibilityMemo.get(element);
+            if (visible === undefined) {
+                visible = checkVisible(element);
+                visibilityMemo.set(element, visible);
+            }
+            return visible;
+        }
+        return checkVisible(element);
+    }
+
+    function checkVisible(element) {
+        if (element.checkVisibility) {
+            if (!element.checkVisibility(VISIBILITY_OPTIONS)) return false;
+        } else {
+            const style = window.getComputedStyle(element);
+            if (style.display === 'none' || style.visibility === 'hidden') return false;
+        }
+        if (element.offsetParent === null) return false;
+
+        const rect = element.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    }
+
+    // Label of a radio, by its 'for' attribute or else a parent label
+    function labelFor(radio) {
+        let label = labelMemo.get(radio);
+        if (label === undefined) {
+            label = (radio.id && document.querySelector(`label[for="${CSS.escape(radio.id)}"]`)) ||
+                    radio.closest('label');
+            labelMemo.set(radio, label);
+        }
+        return label;
+    }
+
+    // Lowercased text of an element. Question, group and container text is
+    // serialized once even when several strategies look at the same element.
+    function lowerText(element) {
+        let text = textMemo.get(element);
+        if (text === undefined) {
+            text = element.textContent.toLowerCase();
+            textMemo.set(element, text);
+        }
+        return text;
+    }
+
+    // First visible group holding radios whose text contains textLower. The
+    // cheap radio check runs first, so only such groups are serialized to text.
+    function findRadioGroup(groups, textLower) {
+        for (const group of groups) {
+            if (group.querySelector('input[type="radio"], [role="radio"]') &&
+                isVisible(group) &&
+                lowerText(group).includes(textLower)) {
+                return group;
+            }
+        }
+        return null;
+    }
+
+    function acceptQuestionElement(node) {
+        return QUESTION_TAGS.has(node.tagName) || node.getAttribute('role') === 'heading'
+            ? NodeFilter.FILTER_ACCEPT
+            : NodeFilter.FILTER_SKIP;
+    }
+
+    function checkRadio(selector, value) {
+        visibilityMemo = new WeakMap();
+        labelMemo = new WeakMap();
+        textMemo = new WeakMap();
+        const selectorLower = selector.toLowerCase();
+        const valueLower = value.toLowerCase();
+        try {
+            // Strategy 1: Find by question text first. The candidates are walked
+            // lazily in document order, so the scan stops at the first match.
+            const potentialQuestionElements = document.createTreeWalker(
+                document.documentElement,
+                NodeFilter.SHOW_ELEMENT,
+                acceptQuestionElement
+            );
+
+            let formSection = null;
+            const body = document.body;
+
+            // Find the section containing our question
+            for (let element = potentialQuestionElements.nextNode(); element;
+                 element = potentialQuestionElements.nextNode()) {
+                if (!isVisible(element)) continue;
+
+                if (lowerText(element).includes(selectorLower)) {
+                    // Found question text, now look up the DOM tree (at most 10
+                    // levels, stopping below the body) for a container with radio
+                    // buttons. Only the first radio is needed to pick a level.
+                    for (let i = 0, section = element; i < 10 && section && section !== body;
+                         i++, section = section.parentElement) {
+                        if (section.querySelector('input[type="radio"], [role="radio"]')) {
+                            formSection = section;
+                            break;
+                        }
+                    }
+
+                    // If we found radio buttons, no need to check other question elements
+                    if (formSection) break;
+                }
+            }
+
+            // If we found a section with radio buttons
+            if (formSection) {
+                // Find all radio containers/buttons
+                const radioButtons = formSection.querySelectorAll('input[type="radio"], [role="radio"]');
+
+                // Innermost label or div around each radio. Containers come in
+                // document order, so a nested one replaces its ancestors and each
+                // radio is tried once, against its own text.
+                const radioContainers = new Map();
+                for (const el of formSection.querySelectorAll('label, div')) {
+                    const radio = el.querySelector('input[type="radio"], [role="radio"]');
+                    if (radio) radioContainers.set(radio, el);
+                }
+
+                // If we have radio buttons
+                if (radioButtons.length > 0) {
+                    // If option value is provided, try to match it
+                    if (value) {
+                        // Method 1: Try matching by container text first
+                        for (const [radio, container] of radioContainers) {
+                            if (!isVisible(container)) continue;
+
+                            const containerText = lowerText(container).trim();
+                            if (containerText.includes(valueLower)) {
+                                // Get XPath before clicking
+                                const xpath = window.__sage.getXPath(radio);
+
+                                // Click the element
+                                radio.click();
+
+                                return {
+                                    success: true,
+                                    method: 'container_text_match',
+                                    xpath: xpath,
+                                    value: value,
+                                    labelText: containerText
+                                };
+                            }
+                        }
+
+                        // Method 2: Try matching directly by radio button value or nearby text
+                        for (const radio of radioButtons) {
+                            if (!isVisible(radio)) continue;
+
+                            // Check radio value
+                            if (radio.value && radio.value.toLowerCase() === valueLower) {
+                                const xpath = window.__sage.getXPath(radio);
+                                radio.click();
+
+                                return {
+                                    success: true,
+                                    method: 'value_match',
+                                    xpath: xpath,
+                                    value: value
+                                };
+                            }
+
+                            // Check nearby text
+                            const radioLabel = labelFor(radio);
+
+                            // Try to find sibling or nearby text
+                            if (!radioLabel) {
+                                const parent = radio.parentElement;
+                                if (parent) {
+                                    const nearbyText = parent.textContent.trim();
+                                    if (nearbyText.toLowerCase().includes(valueLower)) {
+                                        const xpath = window.__sage.getXPath(radio);
+                                        radio.click();
+
+                                        return {
+                                            success: true,
+                                            method: 'nearby_text_match',
+                                            xpath: xpath,
+                                            value: value,
+                                            text: nearbyText
+                                        };
+                                    }
+                                }
+                            }
+
+                            // If we found a label, check its text
+                            if (radioLabel && lowerText(radioLabel).includes(valueLower)) {
+                                const xpath = window.__sage.getXPath(radio);
+                                radio.click();
+
+                                return {
+                                    success: true,
+                                    method: 'label_text_match',
+                                    xpath: xpath,
+                                    value: value,
+                                    labelText: radioLabel.textContent.trim()
+                                };
+                            }
+                        }
+                    }
+
+                    // If value not provided or no match found, select first radio button
+                    const firstRadio = radioButtons[0];
+
+                    if (firstRadio) {
+                        const xpath = window.__sage.getXPath(firstRadio);
+                        firstRadio.click();
+
+                        return {
+                            success: true,
+                            method: 'first_option',
+                            xpath: xpath,
+                            value: value ? `${value} (not found, selected first option)` : 'first option'
+                        };
+                    }
+                }
+            }
+
+            // Strategy 2: Try by direct value matching if selector is a radio name
+            {
+                // Try to find by name attribute + value
+                const radiosByName = document.getElementsByName(selector);
+                if (radiosByName.length > 0) {
+                    // If specific value provided
+                    if (value) {
+                        for (const radio of radiosByName) {
+                            if (radio.type === 'radio' && radio.value === value) {
+                                const radioXPath = window.__sage.getXPath(radio);
+                                radio.checked = true;
+                                radio.dispatchEvent(new Event('change', { bubbles: true }));
+                                radio.click();
+
+                                return { 
+                                    success: true, 
+                                    method: 'name_value_match',
+                                    xpath: radioXPath,
+                                    value: radio.value,
+                                    name: radio.name
+                                };
+                            }
+                        }
+                    }
+
+                    // No matching value or no value provided, select first radio
+                    const firstRadio = radiosByName[0];
+                    if (firstRadio.type === 'radio') {
+                        const radioXPath = window.__sage.getXPath(firstRadio);
+                        firstRadio.checked = true;
+                        firstRadio.dispatchEvent(new Event('change', { bubbles: true }));
+                        firstRadio.click();
+
+                        return { 
+                            success: true, 
+                            method: 'name_first_match',
+                            xpath: radioXPath,
+                            value: firstRadio.value,
+                            name: firstRadio.name
+                        };
+                    }
+                }
+            }
+
+            // Strategy 3: Try by direct CSS selector
+            try {
+                const directRadio = document.querySelector(selector);
+                if (directRadio && (directRadio.type === 'radio' || directRadio.getAttribute('role') === 'radio')) {
+                    const radioXPath = window.__sage.getXPath(directRadio);
+
+                    if (directRadio.type === 'radio') {
+                        directRadio.checked = true;
+                        directRadio.dispatchEvent(new Event('change', { bubbles: true }));
+                    }
+
+                    directRadio.click();
+
+                    return { 
+                        success: true, 
+                        method: 'direct_selector',
+                        xpath: radioXPath,
+                        value: directRadio.value || 'unknown'
+                    };
+                }
+            } catch (e) {
+                // Invalid selector, continue with other methods
+            }
+
+            // Strategy 4: Try to find any radio group with matching question text.
+            // Fieldsets, radio groups and forms are tried before sweeping every div.
+            const group = findRadioGroup(document.querySelectorAll('fieldset, [role="radiogroup"], form'), selectorLower) ||
+                          findRadioGroup(document.getElementsByTagName('div'), selectorLower);
+            if (group) {
+                const radios = group.querySelectorAll('input[type="radio"], [role="radio"]');
+
+                // If value provided, try to match
+                if (value) {
+                    for (const radio of radios) {
+                        if (!isVisible(radio)) continue;
+
+                        const radioContainer = radio.closest('label') || radio.parentElement;
+                        const radioText = radioContainer ? radioContainer.textContent.trim() : '';
+
+                        if (radio.value === value || 
+                            radioText.toLowerCase().includes(valueLower)) {
+
+                            const xpath = window.__sage.getXPath(radio);
+                            radio.click();
+
+                            return {
+                                success: true,
+                                method: 'group_match',
+                                xpath: xpath,
+                                value: value,
+                                groupText: group.textContent.trim().substring(0, 100) + '...'
+                            };
+                        }
+                    }
+                }
+
+                // No match or no value, select first radio
+                const firstRadio = radios[0];
+                const xpath = window.__sage.getXPath(firstRadio);
+                firstRadio.click();
 
-class AnalyzingWebPage(QWebEnginePage):
-    def __init__(self, browser):
-        super().__init__(browser)
-        # You can load automatically in the future
-        # self.loadFinished.connect(self._on_load_finished)
-        self.browser = browser
+                return {
+                    success: true,
+                    method: 'group_first_option',
+                    xpath: xpath,
+                    value: value ? `${value} (not found, selected first option)` : 'first option',
+                    groupText: group.textContent.trim().substring(0, 100) + '...'
+                };
+            }
 
-    def _on_load_finished(self, ok):
-        # Only for compatibility, but this won't auto-run anymore
-        pass
+            return {
+                success: false,
+                message: `Radio button not found for question: ${selector}` + (value ? ` with value: ${value}` : '')
+            };
+        } catch (e) {
+            return {
+                success: false,
+                message: `Error selecting radio option: ${e.message}`
+            };
+        } finally {
+            visibilityMemo = null;
+            labelMemo = null;
+            textMemo = null;
+        }
+    }
+
+    window.__sage.checkRadio = checkRadio;
+})();
+"""
+
+
+# Checks or unchecks a checkbox, installed as window.__sage.checkCheckbox
+_CHECK_CHECKBOX_JS = """
+window.__sage = window.__sage || {};
+(function() {
+    function checkCheckbox(selector, check) {
+        try {
+            // Try various methods to find the checkbox
+            let checkbox = null;
+            let method = '';
+
+            // Method 1: Direct CSS selector
+            try {
+                checkbox = window.__sage.querySelector(selector);
+                if (checkbox && checkbox.type === 'checkbox') {
+                    method = 'css_selector';
+                }
+            } catch (e) {
+                // Invalid selector, continue with other methods
+            }
 
-    def analyze_content(self, ok=True):
-        if ok:
-            self.browser.chat_window.add_message(f"Page loaded, extracting content...", Role.WEB_BROWSER)
-            self.runJavaScript("""
-                (function() {
-                    function getReaderContent() {
-                        // Helper function to get text content while preserving some structure
-                        function extractText(element) {
-                            let text = '';
-
-                            // Handle headings specially
-                            if (element.tagName && element.tagName.match(/^H[1-6]$/)) {
-                                return '## ' + element.textContent.trim() + '\\n\\n';
-                            }
+            // Method 2: By ID
+            if (!checkbox || checkbox.type !== 'checkbox') {
+                checkbox = document.getElementById(selector);
+                if (checkbox && checkbox.type === 'checkbox') {
+                    method = 'id';
+                }
+            }
 
-                            // Handle paragraphs and lists
-                            if (element.tagName === 'P' || element.tagName === 'LI') {
-                                return element.textContent.trim() + '\\n\\n';
-                            }
+            // Method 3: By name
+            if (!checkbox || checkbox.type !== 'checkbox') {
+                const elements = document.getElementsByName(selector);
+                for (const el of elements) {
+                    if (el.type === 'checkbox') {
+                        checkbox = el;
+                        method = 'name';
+                        break;
+                    }
+                }
+            }
 
-                            // Skip hidden elements and unwanted content
-                            if (element.style && (
-                                element.style.display === 'none' ||
-                                element.style.visibility === 'hidden'
-                            )) {
-                                return '';
+            // Method 4: By label text. Labels shorter than the selector cannot
+            // contain it, so they are skipped before lowercasing their text.
+            if (!checkbox || checkbox.type !== 'checkbox') {
+                const selectorLower = selector.toLowerCase();
+                const labels = document.getElementsByTagName('label');
+                for (let i = 0, n = labels.length; i < n; i++) {
+                    const label = labels[i];
+                    const text = label.textContent;
+                    if (text.length < selectorLower.length) continue;
+                    if (text.toLowerCase().includes(selectorLower)) {
+                        if (label.htmlFor) {
+                            const cb = document.getElementById(label.htmlFor);
+                            if (cb && cb.type === 'checkbox') {
+                                checkbox = cb;
+                                method = 'label_text';
+                                break;
                             }
-
-                            // Skip unwanted elements
-                            const unwantedTags = ['SCRIPT', 'STYLE', 'NAV', 'HEADER', 'FOOTER', 
-                                                'ASIDE', 'NOSCRIPT', 'AD', 'IFRAME'];
-                            if (unwantedTags.includes(element.tagName)) {
-                                return '';
+                        } else {
+                            const cb = label.querySelector('input[type="checkbox"]');
+                            if (cb) {
+                                checkbox = cb;
+                                method = 'label_contains';
+                                break;
                             }
+                        }
+                    }
+                }
+            }
 
-                            // Process child nodes
-                            for (const child of element.childNodes) {
-                                if (child.nodeType === Node.TEXT_NODE) {
-                                    text += child.textContent.trim() + ' ';
-                                } else if (child.nodeType === Node.ELEMENT_NODE) {
-                                    text += extractText(child);
-                                }
-                            }
+            if (checkbox && checkbox.type === 'checkbox') {
+                const checkboxXPath = window.__sage.getXPath(checkbox);
+
+                // Don't change state if already in desired state
+                if (checkbox.checked !== check) {
+                    checkbox.checked = check;
+                    checkbox.dispatchEvent(new Event('change', { bubbles: true }));
+
+                    // Also click for compatibility with some frameworks
+                    checkbox.click();
+                }
+
+                const labelText = (() => {
+                    // Try to find associated label text
+                    if (checkbox.id) {
+                        const label = document.querySelector(`label[for="${CSS.escape(checkbox.id)}"]`);
+                        if (label) return label.textContent.trim();
+                    }
 
-                            return text;
+                    // Look for parent label
+                    let parent = checkbox.parentElement;
+                    while (parent && parent.tagName !== 'BODY') {
+                        if (parent.tagName === 'LABEL') {
+                            return parent.textContent.trim();
                         }
+                        parent = parent.parentElement;
+                    }
 
-                        // Try to find main content
-                        const mainSelectors = [
-                            'article',
-                            '[role="main"]',
-                            'main',
-                            '#main-content',
-                            '#content',
-                            '.main-content',
-                            '.content',
-                            '.post-content'
-                        ];
-
-                        let mainContent = null;
-                        for (const selector of mainSelectors) {
-                            const element = document.querySelector(selector);
-                            if (element) {
-                                mainContent = element;
-                                break;
-                            }
+                    return '';
+                })();
+
+                return { 
+                    success: true, 
+                    method: method,
+                    xpath: checkboxXPath,
+                    checked: checkbox.checked,
+                    label: labelText,
+                    id: checkbox.id || '',
+                    name: checkbox.name || ''
+                };
+            }
+
+            return { 
+                success: false, 
+                message: `Checkbox not found with selector: ${selector}` 
+            };
+        } catch (e) {
+            return { 
+                success: false, 
+                message: `Error checking checkbox: ${e.message}` 
+            };
+        }
+    }
+
+    window.__sage.checkCheckbox = checkCheckbox;
+})();
+"""
+
+
+# Clicks custom widgets such as star ratings, installed as
+# window.__sage.clickCustomElement
+_CLICK_CUSTOM_ELEMENT_JS = """
+window.__sage = window.__sage || {};
+(function() {
+    // Most elements the text-content fallback will compare
+    const TEXT_SCAN_LIMIT = 2000;
+
+    function clickCustomElement(selector, attribute, value) {
+        try {
+            let element = null;
+            let method = '';
+
+            // Try as CSS selector
+            try {
+                // If attribute and value provided, make a more specific selector
+                if (attribute && value) {
+                    const attrSelector = `${selector}[${CSS.escape(attribute)}="${CSS.escape(value)}"]`;
+                    element = document.querySelector(attrSelector);
+                    if (element) {
+                        method = 'attribute_selector';
+                    }
+                } else {
+                    element = window.__sage.querySelector(selector);
+                    if (element) {
+                        method = 'css_selector';
+                    }
+                }
+            } catch (e) {
+                // Invalid selector, continue with other methods
+            }
+
+            // Try by ID
+            if (!element) {
+                element = document.getElementById(selector);
+                if (element) {
+                    method = 'id';
+                }
+            }
+
+            // For custom elements like star ratings, try to find by aria-label
+            if (!element && value) {
+                element = document.querySelector(`[${CSS.escape(attribute || 'aria-label')}="${CSS.escape(value)}"]`);
+                if (element) {
+                    method = 'aria_attribute';
+                }
+            }
+
+            // Special handling for common patterns
+
+            // Star ratings (often buttons with star symbols)
+            if (!element && selector.toLowerCase().includes('star')) {
+                const stars = Array.from(document.querySelectorAll('button, [role="button"]')).filter(el => {
+                    return el.textContent.includes('★') || 
+                           el.getAttribute('aria-label')?.toLowerCase().includes('star');
+                });
+
+                // If value is a number 1-5, try to find that star
+                if (value && stars.length > 0) {
+                    const starValue = parseInt(value);
+                    if (!isNaN(starValue) && starValue > 0 && starValue <= stars.length) {
+                        element = stars[starValue - 1];
+                        method = 'star_rating';
+                    }
+                }
+            }
+
+            // Find by text content if other methods fail. Pages with more candidates
+            // than the cap are skipped rather than scanned.
+            if (!element && value) {
+                let candidates = [];
+                try {
+                    candidates = document.querySelectorAll(selector || '*');
+                } catch (e) {
+                    // Invalid selector, nothing to scan
+                }
+                if (candidates.length <= TEXT_SCAN_LIMIT) {
+                    const needle = value.toLowerCase();
+                    for (let i = 0; i < candidates.length; i++) {
+                        const text = candidates[i].textContent;
+                        // Trimming only shrinks the text, so shorter ones can't match
+                        if (text.length >= needle.length && text.trim().toLowerCase() === needle) {
+                            element = candidates[i];
+                            method = 'text_content';
+                            break;
                         }
+                    }
+                }
+            }
 
-                        // If no main content found, use body
-                        const content = mainContent ? extractText(mainContent) : extractText(document.body);
+            if (element) {
+                const elementXPath = window.__sage.getXPath(element);
 
-                        return {
-                            title: document.title,
-                            url: window.location.href,
-                            description: document.querySelector('meta[name="description"]')?.content || '',
-                            content: content.replace(/\\s+/g, ' ').trim(),
-                            readingTime: Math.ceil(content.split(/\\s+/).length / 200), // Approximate reading time in minutes
-                            timestamp: new Date().toISOString()
+                // Get useful information about the element
+                const tagName = element.tagName.toLowerCase();
+                const text = element.textContent.trim();
+                const role = element.getAttribute('role') || '';
+
+                // Scroll into view, unless it is already on screen
+                const rect = element.getBoundingClientRect();
+                if (rect.bottom < 0 || rect.top > window.innerHeight) {
+                    element.scrollIntoView({ behavior: 'auto', block: 'center' });
+                }
+
+                // Click the element
+                element.click();
+
+                return { 
+                    success: true, 
+                    method: method,
+                    xpath: elementXPath,
+                    tag: tagName,
+                    text: text,
+                    role: role,
+                    selector: selector
+                };
+            }
+
+            return { 
+                success: false, 
+                message: `Custom element not found with selector: ${selector}${attribute ? ` and ${attribute}="${value}"` : ''}` 
+            };
+        } catch (e) {
+            return { 
+                success: false, 
+                message: `Error clicking custom element: ${e.message}` 
+            };
+        }
+    }
+
+    window.__sage.clickCustomElement = clickCustomElement;
+})();
+"""
+
+
+# Clicks an element found by selector or text, installed as window.__sage.clickElement
+_CLICK_ELEMENT_JS = """
+window.__sage = window.__sage || {};
+(function() {
+    function clickElement(selector) {
+        // Helper function to find elements by text or other attributes
+        function findClickableElement(selector) {
+            // Try direct CSS selector first
+            try {
+                const element = window.__sage.querySelector(selector);
+                if (element) return { element, method: 'css_selector' };
+            } catch (e) {
+                // Invalid selector, continue with other methods
+            }
+
+            // Try by visible text content
+            const allElements = document.querySelectorAll('a, button, [role="button"], .btn, input[type="button"], input[type="submit"]');
+            for (const el of allElements) {
+                if (el.textContent && el.textContent.toLowerCase().includes(selector.toLowerCase())) {
+                    return { element: el, method: 'text_content' };
+                }
+            }
+
+            // Try by aria-label, title, etc.
+            const labelSelectors = [
+                `[aria-label*="${CSS.escape(selector)}" i]`,
+                `[title*="${CSS.escape(selector)}" i]`,
+                `[alt*="${CSS.escape(selector)}" i]`,
+                `[data-testid*="${CSS.escape(selector)}" i]`
+            ];
+
+            for (const labelSelector of labelSelectors) {
+                try {
+                    const element = document.querySelector(labelSelector);
+                    if (element) return { element, method: 'attribute', selector: labelSelector };
+                } catch (e) {
+                    // Invalid selector, continue
+                }
+            }
+
+            return { element: null, method: 'none' };
+        }
+
+        const result = findClickableElement(selector);
+        if (result.element) {
+            const xpath = window.__sage.getXPath(result.element);
+            result.element.click();
+            return { 
+                success: true, 
+                selector: selector, 
+                method: result.method,
+                xpath: xpath,
+                tag: result.element.tagName
+            };
+        }
+
+        return { success: false, selector: selector, message: 'Element not found' };
+    }
+
+    window.__sage.clickElement = clickElement;
+})();
+"""
+
+
+# Submits a form or clicks its submit button, installed as window.__sage.submitForm
+_SUBMIT_FORM_JS = """
+window.__sage = window.__sage || {};
+(function() {
+    // Submit buttons, most specific first. Buttons labelled Submit, Send or Save
+    // are picked up by the keyword search below.
+    const SUBMIT_BUTTON_SELECTORS = [
+        'button[type="submit"]',
+        'input[type="submit"]',
+        '.form-submit-button',
+        'button.submit',
+        'button.submit-button',
+        'button.primary:not([role="reset"])'
+    ];
+    const SUBMIT_BUTTON_SELECTOR = SUBMIT_BUTTON_SELECTORS.join(', ');
+
+    function submitForm(selector) {
+        // Find and submit the form or click a submit button
+        try {
+            // PRIORITY CHANGE: First look for submit buttons since we want to click them.
+            // The page is searched once for all the selectors; among the visible
+            // matches, the one matching the earliest selector wins.
+            let bestButton = null;
+            let bestPriority = SUBMIT_BUTTON_SELECTORS.length;
+            for (const btn of document.querySelectorAll(SUBMIT_BUTTON_SELECTOR)) {
+                const priority = SUBMIT_BUTTON_SELECTORS.findIndex(buttonSelector => btn.matches(buttonSelector));
+                if (priority >= bestPriority) continue;
+
+                const style = window.getComputedStyle(btn);
+                if (style.display !== 'none' && style.visibility !== 'hidden' && btn.offsetParent !== null) {
+                    const rect = btn.getBoundingClientRect();
+                    if (rect.width > 0 && rect.height > 0) {
+                        bestButton = btn;
+                        bestPriority = priority;
+                        if (priority === 0) break;
+                    }
+                }
+            }
+
+            if (bestButton) {
+                // Important: Get the XPath BEFORE clicking
+                const buttonXPath = window.__sage.getXPath(bestButton);
+                const buttonText = bestButton.textContent.trim() || bestButton.value || "Submit Button";
+
+                // Now click the button
+                bestButton.click();
+
+                return { 
+                    success: true, 
+                    method: 'submit_button_click', 
+                    buttonText: buttonText,
+                    xpath: buttonXPath,
+                    element: SUBMIT_BUTTON_SELECTORS[bestPriority]
+                };
+            }
+
+            // Manual search for any button that looks like a submit button
+            const allButtons = Array.from(document.querySelectorAll('button, input[type="button"], [role="button"]'));
+            const submitKeywords = ['submit', 'send', 'save', 'continue', 'next', 'finish', 'complete', 'done'];
+
+            for (const btn of allButtons) {
+                const buttonText = (btn.textContent || btn.value || '').toLowerCase();
+                const matchesKeyword = submitKeywords.some(keyword => buttonText.includes(keyword));
+
+                // Check if any attribute or class suggests it's a submit button
+                const hasSubmitClass = btn.className.toLowerCase().includes('submit') || 
+                                      btn.className.toLowerCase().includes('primary');
+
+                if (matchesKeyword || hasSubmitClass) {
+                    try {
+                        // Important: Get the XPath BEFORE clicking
+                        const buttonXPath = window.__sage.getXPath(btn);
+                        const displayText = btn.textContent.trim() || btn.value || "Button";
+                        const keyword = matchesKeyword ? 
+                            submitKeywords.find(k => buttonText.includes(k)) : 'class-based';
+
+                        // Now click the button
+                        btn.click();
+
+                        return { 
+                            success: true, 
+                            method: 'keyword_button_click', 
+                            buttonText: displayText,
+                            keyword: keyword,
+                            xpath: buttonXPath
                         };
+                    } catch (e) {
+                        console.log("Button click error:", e);
                     }
+                }
+            }
 
-                    return getReaderContent();
-                })();
-            """, self._handle_page_content)
+            // Try with the custom selector if provided
+            if (selector !== 'form') {
+                const customElement = window.__sage.querySelector(selector);
+                if (customElement) {
+                    // Is it a form?
+                    if (customElement.tagName === 'FORM') {
+                        customElement.submit();
+                        return { 
+                            success: true, 
+                            method: 'custom_form_submit', 
+                            formId: customElement.id || 'unnamed',
+                            xpath: window.__sage.getXPath(customElement)
+                        };
+                    }
+
+                    // Is it a button or clickable element?
+                    else if (customElement.tagName === 'BUTTON' || 
+                             customElement.tagName === 'INPUT' ||
+                             customElement.getAttribute('role') === 'button') {
+
+                        // Get XPath before clicking
+                        const elementXPath = window.__sage.getXPath(customElement);
+                        const elementText = customElement.textContent.trim() || customElement.value || "Custom Element";
+
+                        // Click the element
+                        customElement.click();
+
+                        return { 
+                            success: true, 
+                            method: 'custom_element_click', 
+                            elementText: elementText,
+                            xpath: elementXPath,
+                            selector: selector
+                        };
+                    }
+                }
+            }
+
+            // Try to submit any form as a last resort
+            const form = document.querySelector('form');
+            if (form) {
+                try {
+                    const formXPath = window.__sage.getXPath(form);
+                    form.submit();
+                    return { 
+                        success: true, 
+                        method: 'form_submit', 
+                        formId: form.id || 'unnamed',
+                        xpath: formXPath
+                    };
+                } catch (e) {
+                    // Form submission error
+                    console.log("Form submit error:", e);
+                }
+            }
+
+            // If we got here, we didn't find any submit button or form
+            return { success: false, message: 'No submit button or form found' };
+        } catch (e) {
+            return { success: false, message: `Error during form submission: ${e.message}` };
+        }
+    }
+
+    window.__sage.submitForm = submitForm;
+})();
+"""
+
+
+# Describes an element for debugging, installed as window.__sage.debugElement
+_DEBUG_ELEMENT_JS = """
+window.__sage = window.__sage || {};
+(function() {
+    function debugElement(selector) {
+        try {
+            const element = window.__sage.querySelector(selector);
+            if (!element) {
+                return { found: false, message: 'Element not found' };
+            }
+
+            // Get all attributes
+            const attributes = {};
+            for (const attr of element.attributes) {
+                attributes[attr.name] = attr.value;
+            }
+
+            // Get computed styles
+            const styles = {};
+            const computed = window.getComputedStyle(element);
+            ['display', 'visibility', 'position', 'z-index', 'pointer-events'].forEach(
+                prop => styles[prop] = computed[prop]
+            );
+
+            return {
+                found: true,
+                tagName: element.tagName,
+                id: element.id,
+                className: element.className,
+                type: element.type,
+                value: element.value,
+                checked: element.checked,
+                disabled: element.disabled,
+                readOnly: element.readOnly,
+                attributes: attributes,
+                styles: styles,
+                rect: {
+                    top: element.getBoundingClientRect().top,
+                    right: element.getBoundingClientRect().right,
+                    bottom: element.getBoundingClientRect().bottom,
+                    left: element.getBoundingClientRect().left,
+                    width: element.getBoundingClientRect().width,
+                    height: element.getBoundingClientRect().height
+                },
+                isVisible: element.offsetWidth > 0 && element.offsetHeight > 0,
+                html: element.outerHTML.substring(0, 500), // Limit HTML to 500 chars
+                xpath: window.__sage.getXPath(element)
+            };
+        } catch (e) {
+            return { found: false, message: 'Error: ' + e.message };
+        }
+    }
+
+    window.__sage.debugElement = debugElement;
+})();
+"""
+
+# Runs several of the helpers above in order in one call, installed as
+# window.__sage.runActions. Each call is a [helper name, arguments] pair and the
+# results come back in the same order; a call that fails only fails its own slot.
+_RUN_ACTIONS_JS = """
+window.__sage = window.__sage || {};
+(function() {
+    function runActions(calls) {
+        const results = [];
+        for (let i = 0; i < calls.length; i++) {
+            const [name, args] = calls[i];
+            try {
+                results.push(window.__sage[name](...args));
+            } catch (e) {
+                results.push({ success: false, message: `Error running ${name}: ${e.message}` });
+            }
+        }
+        return results;
+    }
+
+    window.__sage.runActions = runActions;
+})();
+"""
+
+
+# Scripts installed into every page, each adding its helpers to window.__sage
+_HELPER_SCRIPTS = (
+    ("sage_xpath", _XPATH_JS),
+    ("sage_query", _QUERY_JS),
+    ("sage_extract", _EXTRACT_JS),
+    ("sage_form_fields", _FORM_FIELDS_JS),
+    ("sage_fill_by_xpath", _FILL_BY_XPATH_JS),
+    ("sage_fill_form", _FILL_FORM_JS),
+    ("sage_select_option", _SELECT_OPTION_JS),
+    ("sage_check_radio", _CHECK_RADIO_JS),
+    ("sage_check_checkbox", _CHECK_CHECKBOX_JS),
+    ("sage_click_custom_element", _CLICK_CUSTOM_ELEMENT_JS),
+    ("sage_click_element", _CLICK_ELEMENT_JS),
+    ("sage_submit_form", _SUBMIT_FORM_JS),
+    ("sage_debug_element", _DEBUG_ELEMENT_JS),
+    ("sage_run_actions", _RUN_ACTIONS_JS),
+)
+
+
+# Directory saved pages are written to, and whether it is known to exist yet
+_SAVE_DIR = "saved_pages"
+_save_dir_ready = False
+
+
+class PageSaveSignals(QObject):
+    saved = pyqtSignal(str)
+    error_occurred = pyqtSignal(str)
+
+
+class PageSaveTask(QRunnable):
+    """Clean page content and write it to a markdown file off the UI thread"""
+
+    def __init__(self, signals, filename, header, content):
+        super().__init__()
+        self.signals = signals
+        self.filename = filename
+        self.header = header
+        self.content = content
+
+    def run(self):
+        global _save_dir_ready
+        try:
+            # Create the folder for saved pages on the first save only
+            if not _save_dir_ready:
+                os.makedirs(_SAVE_DIR, exist_ok=True)
+                _save_dir_ready = True
+
+            cleaned_body = clean_content(self.content)
+
+            # Write the pieces through one large buffer rather than assembling the
+            # whole document first
+            with open(self.filename, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.writelines((self.header, cleaned_body, "\n"))
+
+            self.signals.saved.emit(self.filename)
+        except Exception as e:
+            # Check the folder again next time in case it was removed
+            _save_dir_ready = False
+            self.signals.error_occurred.emit(str(e))
+
+
+class AnalyzingWebPage(QWebEnginePage):
+    EXTRACT_CACHE_SIZE = 32
+
+    def __init__(self, browser, profile=None, auto_extract=False):
+        if profile is not None:
+            super().__init__(profile, browser)
+        else:
+            super().__init__(browser)
+        self.browser = browser
+
+        # LRU cache of extracted page data keyed by (url, DOM size)
+        self._extract_cache = OrderedDict()
+
+        # Set while an extraction is running so overlapping requests are dropped
+        self._extraction_in_flight = False
+
+        # Results of page saves running on the thread pool
+        self._save_signals = PageSaveSignals(self)
+        self._save_signals.saved.connect(self._handle_page_saved)
+        self._save_signals.error_occurred.connect(self._handle_page_save_error)
+
+        self.install_helper_scripts()
+
+        # Automatic analysis on every page load is opt-in; by default pages are
+        # only analyzed when the user asks for it
+        if auto_extract:
+            self.loadFinished.connect(self.analyze_content)
+
+    def install_helper_scripts(self):
+        """Pin the window.__sage helpers into every document loaded by this page"""
+        for name, source in _HELPER_SCRIPTS:
+            script = QWebEngineScript()
+            script.setName(name)
+            script.setSourceCode(source)
+            # Only defines a function, so it is safe to run before the DOM exists
+            script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentCreation)
+            script.setWorldId(QWebEngineScript.ScriptWorldId.ApplicationWorld.value)
+            script.setRunsOnSubFrames(False)
+            self.scripts().insert(script)
+
+    def clear_cache(self):
+        """Drop all cached extraction results"""
+        self._extract_cache.clear()
+
+    def analyze_content(self, ok=True):
+        if ok:
+            if self._extraction_in_flight:
+                return
+            # Browser-internal and inline pages have nothing worth extracting
+            if self.url().scheme() in _SKIPPED_SCHEMES:
+                return
+            self._extraction_in_flight = True
+
+            # Fingerprint the page first so repeat analyses skip the full DOM walk
+            self.runJavaScript(
+                _FINGERPRINT_JS,
+                QWebEngineScript.ScriptWorldId.ApplicationWorld.value,
+                self._handle_fingerprint
+            )
+
+    def _handle_fingerprint(self, fingerprint):
+        """Serve extraction from cache when the page is unchanged, otherwise extract"""
+        key = tuple(fingerprint) if fingerprint else None
+
+        if key in self._extract_cache:
+            self._extract_cache.move_to_end(key)
+            self.browser.chat_window.add_message("Page unchanged, using cached content...", Role.WEB_BROWSER)
+            self._handle_page_content(self._extract_cache[key])
+            return
+
+        self.browser.chat_window.add_message(f"Page loaded, extracting content...", Role.WEB_BROWSER)
+        self.runJavaScript(
+            _EXTRACT_CALL_JS,
+            QWebEngineScript.ScriptWorldId.ApplicationWorld.value,
+            lambda page_data: self._handle_extracted_content(key, page_data)
+        )
+
+    def _handle_extracted_content(self, key, page_data):
+        """Cache freshly extracted page data before handing it off"""
+        if isinstance(page_data, str):
+            try:
+                page_data = json.loads(page_data)
+            except ValueError:
+                pass
+
+        if key is not None and isinstance(page_data, dict):
+            self._extract_cache[key] = page_data
+            self._extract_cache.move_to_end(key)
+            while len(self._extract_cache) > self.EXTRACT_CACHE_SIZE:
+                self._extract_cache.popitem(last=False)
+
+        self._handle_page_content(page_data)
 
     def _handle_page_content(self, page_data):
         """Handle extracted page content and create compressed markdown for vector search"""
-        import re
-        import hashlib
-        import os
-        from datetime import datetime
+        self._extraction_in_flight = False
 
         # Normalize page_data if it's not a dictionary
         if isinstance(page_data, (str, int, float)):
@@ -133,22 +2761,23 @@ class AnalyzingWebPage(QWebEnginePage):
             )
             return
 
-        # Extract key data
-        url = page_data.get('url', 'Unknown URL')
-        title = page_data.get('title', 'Unknown Title')
-        description = page_data.get('description', '')
-        content = page_data.get('content', '').strip()
-        reading_time = page_data.get('readingTime', 0)
-
-        # Log the extracted content (for debugging)
-        print("\n=== Extracted Reader Content ===")
-        print(f"URL: {url}")
-        print(f"Title: {title}")
-        print(f"Description: {description}")
-        print(f"Reading Time: ~{reading_time} minutes")
-        print("\nContent Preview:")
-        print(content[:1000] if content else "No content")
-        print("=== End Reader Content ===\n")
+        # Extract key data once into locals
+        url = page_data.get('url') or 'Unknown URL'
+        title = page_data.get('title') or 'Unknown Title'
+        description = page_data.get('description') or ''
+        content = _WHITESPACE_RE.sub(' ', page_data.get('content') or '').strip()
+        reading_time = estimate_reading_time(content)
+
+        # Log the extracted content (for debugging). Skipped entirely unless
+        # debug logging is on, since this runs on the GUI thread.
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "\n=== Extracted Reader Content ===\n"
+                "URL: %s\nTitle: %s\nDescription: %s\nReading Time: ~%s minutes\n"
+                "\nContent Preview:\n%s\n=== End Reader Content ===\n",
+                url, title, description, reading_time,
+                content[:1000] if content else "No content"
+            )
 
         # Check if we have content to process
         if not content:
@@ -158,104 +2787,56 @@ class AnalyzingWebPage(QWebEnginePage):
             )
             return
 
-        # Create a folder for saved pages if it doesn't exist
-        save_dir = "saved_pages"
-        if not os.path.exists(save_dir):
-            os.makedirs(save_dir)
-
         # Create hash of URL for unique filename
-        url_hash = hashlib.md5(url.encode()).hexdigest()[:10]
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{save_dir}/{url_hash}_{timestamp}.md"
+        url_hash = hashlib.blake2b(url.encode('utf-8'), digest_size=5).hexdigest()
+        now = datetime.now()
+        filename = f"{_SAVE_DIR}/{url_hash}_{now:%Y%m%d_%H%M%S}.md"
 
         # Create a clean domain name for metadata
         domain = url.split("//")[-1].split("/")[0]
 
-        # Process the content for markdown conversion
-        def clean_content(text):
-            """Clean and structure the content for markdown"""
-            # Replace multiple newlines with double newline for markdown paragraphs
-            text = re.sub(r'\n{3,}', '\n\n', text)
-
-            # Try to identify and format headings
-            lines = text.split('\n')
-            formatted_lines = []
-
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    formatted_lines.append('')
-                    continue
-
-                # Check if line looks like a heading (short, ends with no punctuation)
-                if len(line) < 80 and not line[-1] in '.,:;?!' and line.istitle():
-                    # Make it a markdown heading
-                    formatted_lines.append(f'## {line}')
-                else:
-                    formatted_lines.append(line)
-
-            return '\n'.join(formatted_lines)
-
-        # Create compressed markdown with metadata
-        markdown_content = f"""---
-    title: "{title}"
-    url: {url}
-    domain: {domain}
-    date_saved: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-    reading_time: {reading_time} minutes
-    description: "{description}"
-    ---
-
-    # {title}
-
-    *Source: [{domain}]({url})*
-
-    {clean_content(content)}
-    """
-
-        # Save the markdown file
-        try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(markdown_content)
-
-            self.browser.chat_window.add_message(
-                f"✓ Page saved as markdown for vector search: {os.path.basename(filename)}",
-                Role.WEB_BROWSER
-            )
-        except Exception as e:
-            self.browser.chat_window.add_message(
-                f"✗ Error saving page: {str(e)}",
-                Role.WEB_BROWSER
-            )
+        # Create compressed markdown with metadata. Title and description come
+        # from the page, so they are JSON-quoted to stay valid YAML.
+        front_matter = (
+            "---\n"
+            f"title: {json.dumps(title, ensure_ascii=False)}\n"
+            f"url: {url}\n"
+            f"domain: {domain}\n"
+            f"date_saved: {now:%Y-%m-%d %H:%M:%S}\n"
+            f"reading_time: {reading_time} minutes\n"
+            f"truncated: {'true' if page_data.get('truncated') else 'false'}\n"
+            f"description: {json.dumps(description, ensure_ascii=False)}\n"
+            "---\n"
+        )
+
+        # Cleaning and writing the markdown file happen on the thread pool so
+        # large pages don't hold up the UI; the result comes back as a signal
+        header = front_matter + f"\n# {title}\n\n*Source: [{domain}]({url})*\n\n"
+        QThreadPool.globalInstance().start(
+            PageSaveTask(self._save_signals, filename, header, content)
+        )
 
         # Check if we should analyze the content with LLM
         self.browser.chat_window.add_message("🔍 Analyzing reader-mode content...", Role.WEB_BROWSER)
 
-        # Build LLM prompt with enhanced analysis requests for vector search optimization
-        prompt = f"""Analyzing webpage in reader mode:
-    URL: {url}
-    Title: {title}
-    Description: {description}
-    Estimated Reading Time: {reading_time} minutes
-
-    Content:
-    {content[:2000]}...
-
-    Please provide a concise analysis including:
-    1. Summary of the main content (2-3 sentences)
-    2. Key topics covered
-    3. Objective assessment of information quality and reliability 
-    4. Any potential biases or perspectives present
-    5. Context this content fits within
-    6. Key entities (people, organizations, products, locations)
-    7. Suggested keywords or tags for vector search indexing
-
-    The last two items are important for search and retrieval purposes.
-    """
-
-        # Send to LLM for analysis if available
+        # Queue for LLM analysis if available. The queue is flushed from a timer,
+        # so this JS callback returns and the UI can repaint first.
         if hasattr(self.browser, 'llm_integration'):
-            self.browser.handle_chat_message(prompt)
+            # The page itself travels as structured context rather than being pasted
+            # into the prompt, so the LLM layer can keep it as a stable prefix that
+            # is reused across follow-up questions about the same page
+            page_context = {
+                'url': url,
+                'title': title,
+                'description': description,
+                'reading_time': reading_time,
+                'content': content[:2000]
+            }
+
+            # Build LLM prompt with enhanced analysis requests for vector search optimization
+            prompt = _ANALYSIS_PROMPT_TEMPLATE % {'title': title}
+
+            self.browser.queue_page_analysis(prompt, page_context)
         else:
             self.browser.chat_window.add_message(
                 "Cannot analyze - LLM not initialized",
@@ -265,170 +2846,59 @@ class AnalyzingWebPage(QWebEnginePage):
         # Return the saved filename for future reference
         return filename
 
+    def _handle_page_saved(self, filename):
+        self.browser.chat_window.add_message(
+            f"✓ Page saved as markdown for vector search: {os.path.basename(filename)}",
+            Role.WEB_BROWSER
+        )
+
+    def _handle_page_save_error(self, error):
+        self.browser.chat_window.add_message(
+            f"✗ Error saving page: {error}",
+            Role.WEB_BROWSER
+        )
+
 
 class WebViewAutomator:
+    XPATH_CACHE_SIZE = 256
+    # Fields filled per fillForm call; the page gets to paint and handle input
+    # between chunks instead of freezing for the whole form
+    FILL_FORM_CHUNK_SIZE = 10
+
     def __init__(self, browser):
         self.browser = browser
         self.web_view = browser.web_view
 
-    def detect_form_fields(self):
-        """Scan the page and detect all form fields with their properties"""
-        js_script = """
-        (function() {
-            try {
-                // Helper function to check if element is visible
-                function isVisible(element) {
-                    if (!element) return false;
-                    const style = window.getComputedStyle(element);
-                    return style.display !== 'none' && 
-                           style.visibility !== 'hidden' && 
-                           element.offsetParent !== null &&
-                           element.getBoundingClientRect().width > 0 && 
-                           element.getBoundingClientRect().height > 0;
-                }
-
-                // Get label text for a form field
-                function getLabelText(element) {
-                    // Check for label with 'for' attribute
-                    if (element.id) {
-                        const label = document.querySelector(`label[for="${element.id}"]`);
-                        if (label && label.textContent.trim()) {
-                            return label.textContent.trim();
-                        }
-                    }
-
-                    // Check for parent label
-                    const parentLabel = element.closest('label');
-                    if (parentLabel && parentLabel.textContent.trim()) {
-                        // Remove the text of the input itself from the label text
-                        const clone = parentLabel.cloneNode(true);
-                        const inputs = clone.querySelectorAll('input, select, textarea');
-                        inputs.forEach(input => input.remove());
-                        return clone.textContent.trim();
-                    }
-
-                    // Look for nearby text that might serve as label
-                    const parent = element.parentElement;
-                    if (parent) {
-                        // Check for text nodes or elements that might be labels
-                        const possibleLabels = Array.from(parent.childNodes)
-                            .filter(node => {
-                                return (node.nodeType === 3 && node.textContent.trim()) || // Text node
-                                      (node.nodeType === 1 && 
-                                       node !== element && 
-                                       !['INPUT', 'SELECT', 'TEXTAREA', 'BUTTON'].includes(node.tagName) &&
-                                       node.textContent.trim());
-                            });
-
-                        if (possibleLabels.length > 0) {
-                            return possibleLabels[0].textContent.trim();
-                        }
-                    }
-
-                    // Check for aria-label
-                    if (element.getAttribute('aria-label')) {
-                        return element.getAttribute('aria-label');
-                    }
-
-                    // Check for placeholder
-                    if (element.getAttribute('placeholder')) {
-                        return element.getAttribute('placeholder');
-                    }
-
-                    // Fallback to name or id
-                    return element.name || element.id || "";
-                }
-
-                // Function to determine field type
-                function getFieldType(element) {
-                    if (element.tagName === 'SELECT') {
-                        return 'select';
-                    }
-
-                    if (element.tagName === 'TEXTAREA') {
-                        return 'textarea';
-                    }
-
-                    if (element.tagName === 'INPUT') {
-                        return element.type || 'text';
-                    }
-
-                    if (element.getAttribute('contenteditable') === 'true') {
-                        return 'contenteditable';
-                    }
-
-                    return 'unknown';
-                }
-
-                // Find all form fields
-                const formFields = [];
-                const inputElements = document.querySelectorAll('input:not([type="hidden"]), select, textarea, [contenteditable="true"]');
-
-                inputElements.forEach(element => {
-                    if (!isVisible(element)) return;
-
-                    const labelText = getLabelText(element);
-                    const fieldType = getFieldType(element);
-                    const required = element.required || element.getAttribute('aria-required') === 'true';
-
-                    // Get options for select elements
-                    let options = [];
-                    if (element.tagName === 'SELECT') {
-                        options = Array.from(element.options).map(option => ({
-                            value: option.value,
-                            text: option.text
-                        }));
-                    }
-
-                    // Get radio button options if this is part of a radio group
-                    let radioOptions = [];
-                    if (fieldType === 'radio' && element.name) {
-                        const radioGroup = document.querySelectorAll(`input[type="radio"][name="${element.name}"]`);
-                        if (radioGroup.length > 1) {
-                            radioOptions = Array.from(radioGroup).map(radio => {
-                                const radioLabel = getLabelText(radio);
-                                return {
-                                    value: radio.value,
-                                    text: radioLabel || radio.value
-                                };
-                            });
-                        }
-                    }
-
-                    // Filter out fields with no identification
-                    if (labelText || element.name || element.id || element.placeholder) {
-                        formFields.push({
-                            label: labelText,
-                            name: element.name || "",
-                            id: element.id || "",
-                            type: fieldType,
-                            required: required,
-                            placeholder: element.placeholder || "",
-                            options: options,
-                            radioOptions: radioOptions,
-                            hasValue: element.value ? true : false,
-                            selector: element.id ? `#${element.id}` : 
-                                     element.name ? `[name="${element.name}"]` : null
-                        });
-                    }
-                });
-
-                return { 
-                    success: true, 
-                    fields: formFields,
-                    url: window.location.href,
-                    title: document.title
-                };
-            } catch (e) {
-                return { 
-                    success: false, 
-                    message: `Error detecting form fields: ${e.message}` 
-                };
-            }
-        })();
-        """
-
-        self.web_view.page().runJavaScript(js_script, self._handle_detect_fields_result)
+        # XPaths found by field mapping, keyed by (page url, lowercased field
+        # label), so later fills on the same form can skip the label search
+        self._xpath_cache = OrderedDict()
+
+        # Result messages posted while handling one batch of callbacks, sent to
+        # the chat window together once control returns to the event loop
+        self._pending_messages = []
+        self._message_timer = QTimer(browser)
+        self._message_timer.setSingleShot(True)
+        self._message_timer.setInterval(0)
+        self._message_timer.timeout.connect(self._flush_messages)
+
+    def _post_message(self, message):
+        """Queue a result message for the chat window"""
+        self._pending_messages.append(message)
+        self._message_timer.start()
+
+    def _flush_messages(self):
+        """Show all queued result messages as one chat message"""
+        messages, self._pending_messages = self._pending_messages, []
+        if messages:
+            self.browser.chat_window.add_message("\n".join(messages), Role.WEB_BROWSER)
+
+    def detect_form_fields(self):
+        """Scan the page and detect all form fields with their properties"""
+        self.web_view.page().runJavaScript(
+            "window.__sage.collectFields({withXPath: false})",
+            QWebEngineScript.ScriptWorldId.ApplicationWorld.value,
+            self._handle_detect_fields_result
+        )
 
     def _handle_detect_fields_result(self, result):
         """Handle the result of form field detection"""
@@ -442,13 +2912,13 @@ class WebViewAutomator:
                     if field.get('required'):
                         field_info += " [Required]"
 
-                    if field.get('options') and len(field.get('options')) > 0:
-                        options_str = ", ".join([opt.get('text') for opt in field.get('options')])
-                        field_info += f" [Options: {options_str}]"
+                    options = field.get('options')
+                    if options:
+                        field_info += f" [Options: {', '.join(opt.get('text') for opt in options)}]"
 
-                    if field.get('radioOptions') and len(field.get('radioOptions')) > 0:
-                        options_str = ", ".join([opt.get('text') for opt in field.get('radioOptions')])
-                        field_info += f" [Options: {options_str}]"
+                    radio_options = field.get('radioOptions')
+                    if radio_options:
+                        field_info += f" [Options: {', '.join(opt.get('text') for opt in radio_options)}]"
 
                     formatted_fields.append(field_info)
 
@@ -482,235 +2952,15 @@ class WebViewAutomator:
 
     def map_form_fields(self):
         """Create a detailed mapping of form fields with their properties"""
-        js_script = """
-        (function() {
-            try {
-                // Helper function to check if element is visible
-                function isVisible(element) {
-                    if (!element) return false;
-                    const style = window.getComputedStyle(element);
-                    return style.display !== 'none' && 
-                           style.visibility !== 'hidden' && 
-                           element.offsetParent !== null &&
-                           element.getBoundingClientRect().width > 0 && 
-                           element.getBoundingClientRect().height > 0;
-                }
-
-                // Get label text for a form field
-                function getLabelText(element) {
-                    // Check for label with 'for' attribute
-                    if (element.id) {
-                        const label = document.querySelector(`label[for="${element.id}"]`);
-                        if (label && label.textContent.trim()) {
-                            return label.textContent.trim();
-                        }
-                    }
-
-                    // Check for parent label
-                    const parentLabel = element.closest('label');
-                    if (parentLabel && parentLabel.textContent.trim()) {
-                        // Remove the text of the input itself from the label text
-                        const clone = parentLabel.cloneNode(true);
-                        const inputs = clone.querySelectorAll('input, select, textarea');
-                        inputs.forEach(input => input.remove());
-                        return clone.textContent.trim();
-                    }
-
-                    // Look for nearby text that might serve as label
-                    const parent = element.parentElement;
-                    if (parent) {
-                        // Check for text nodes or elements that might be labels
-                        const possibleLabels = Array.from(parent.childNodes)
-                            .filter(node => {
-                                return (node.nodeType === 3 && node.textContent.trim()) || // Text node
-                                      (node.nodeType === 1 && 
-                                       node !== element && 
-                                       !['INPUT', 'SELECT', 'TEXTAREA', 'BUTTON'].includes(node.tagName) &&
-                                       node.textContent.trim());
-                            });
-
-                        if (possibleLabels.length > 0) {
-                            return possibleLabels[0].textContent.trim();
-                        }
-                    }
-
-                    // Check for aria-label
-                    if (element.getAttribute('aria-label')) {
-                        return element.getAttribute('aria-label');
-                    }
-
-                    // Check for placeholder
-                    if (element.getAttribute('placeholder')) {
-                        return element.getAttribute('placeholder');
-                    }
-
-                    // Fallback to name or id
-                    return element.name || element.id || "";
-                }
-
-                // Function to determine field type
-                function getFieldType(element) {
-                    if (element.tagName === 'SELECT') {
-                        return 'select';
-                    }
-
-                    if (element.tagName === 'TEXTAREA') {
-                        return 'textarea';
-                    }
-
-                    if (element.tagName === 'INPUT') {
-                        return element.type || 'text';
-                    }
-
-                    if (element.getAttribute('contenteditable') === 'true') {
-                        return 'contenteditable';
-                    }
-
-                    return 'unknown';
-                }
-
-                // Function to get XPath of an element
-                function getXPath(element) {
-                    if (!element) return "/none";
-                    if (element.id) return `//*[@id="${element.id}"]`;
-
-                    let path = '';
-                    let current = element;
-
-                    while (current && current.nodeType === 1) {
-                        let index = 1;
-                        let sibling = current.previousSibling;
-
-                        while (sibling) {
-                            if (sibling.nodeType === 1 && sibling.tagName === current.tagName) {
-                                index++;
-                            }
-                            sibling = sibling.previousSibling;
-                        }
-
-                        const tagName = current.tagName.toLowerCase();
-                        const pathIndex = (index > 1) ? `[${index}]` : '';
-                        path = `/${tagName}${pathIndex}${path}`;
-
-                        current = current.parentNode;
-                        if (!current || current.tagName === 'BODY' || current === document) break;
-                    }
-
-                    return path || "/unknown";
-                }
-
-                // Function to get example value based on field type and label
-                function getExampleValue(field) {
-                    const type = field.type;
-                    const label = (field.label || field.name || field.id || "").toLowerCase();
-
-                    // Based on field type and label, suggest appropriate values
-                    if (type === 'text' || type === 'textarea') {
-                        if (label.includes('name')) {
-                            return "John Doe";
-                        } else if (label.includes('email')) {
-                            return "example@email.com";
-                        } else if (label.includes('phone')) {
-                            return "555-123-4567";
-                        } else if (label.includes('address')) {
-                            return "123 Main Street";
-                        } else {
-                            return "Sample text";
-                        }
-                    } else if (type === 'select') {
-                        return field.options.length > 0 ? field.options[0].text : "Select an option";
-                    } else if (type === 'radio') {
-                        return field.radioOptions.length > 0 ? field.radioOptions[0].text : "Select an option";
-                    } else if (type === 'checkbox') {
-                        return "true";
-                    } else if (type === 'email') {
-                        return "example@email.com";
-                    } else if (type === 'number') {
-                        return "42";
-                    } else if (type === 'date') {
-                        return "2025-04-27";
-                    } else {
-                        return "Sample value";
-                    }
-                }
-
-                // Find all form fields
-                const formFields = [];
-                const inputElements = document.querySelectorAll('input:not([type="hidden"]), select, textarea, [contenteditable="true"]');
-
-                inputElements.forEach(element => {
-                    if (!isVisible(element)) return;
-
-                    const labelText = getLabelText(element);
-                    const fieldType = getFieldType(element);
-                    const required = element.required || element.getAttribute('aria-required') === 'true';
-
-                    // Get options for select elements
-                    let options = [];
-                    if (element.tagName === 'SELECT') {
-                        options = Array.from(element.options).map(option => ({
-                            value: option.value,
-                            text: option.text
-                        }));
-                    }
-
-                    // Get radio button options if this is part of a radio group
-                    let radioOptions = [];
-                    if (fieldType === 'radio' && element.name) {
-                        const radioGroup = document.querySelectorAll(`input[type="radio"][name="${element.name}"]`);
-                        if (radioGroup.length > 1) {
-                            radioOptions = Array.from(radioGroup).map(radio => {
-                                const radioLabel = getLabelText(radio);
-                                return {
-                                    value: radio.value,
-                                    text: radioLabel || radio.value
-                                };
-                            });
-                        }
-                    }
-
-                    // Filter out fields with no identification
-                    if (labelText || element.name || element.id || element.placeholder) {
-                        const field = {
-                            label: labelText,
-                            name: element.name || "",
-                            id: element.id || "",
-                            type: fieldType,
-                            required: required,
-                            placeholder: element.placeholder || "",
-                            options: options,
-                            radioOptions: radioOptions,
-                            hasValue: element.value ? true : false,
-                            selector: element.id ? `#${element.id}` : 
-                                     element.name ? `[name="${element.name}"]` : null,
-                            xpath: getXPath(element)
-                        };
-
-                        // Add example value
-                        field.example = getExampleValue(field);
-
-                        formFields.push(field);
-                    }
-                });
-
-                return { 
-                    success: true, 
-                    fields: formFields,
-                    url: window.location.href,
-                    title: document.title
-                };
-            } catch (e) {
-                return { 
-                    success: false, 
-                    message: `Error mapping form fields: ${e.message}` 
-                };
-            }
-        })();
-        """
-
-        self.web_view.page().runJavaScript(js_script, self._handle_map_fields_result)
-
-    def _handle_map_fields_result(self, result):
+        # XPaths are cached under the same URL form fill_form looks them up by
+        url = self.web_view.url().toString()
+        self.web_view.page().runJavaScript(
+            "window.__sage.collectFields({withXPath: true})",
+            QWebEngineScript.ScriptWorldId.ApplicationWorld.value,
+            lambda result: self._handle_map_fields_result(result, url)
+        )
+
+    def _handle_map_fields_result(self, result, url=None):
         """Handle the result of form field mapping"""
         if result.get('success'):
             fields = result.get('fields', [])
@@ -727,27 +2977,31 @@ class WebViewAutomator:
                     xpath = field.get('xpath')
                     example = field.get('example')
 
-                    detail = f"{i + 1}. Field: '{label}'\n"
-                    detail += f"   Type: {field_type}\n"
-                    detail += f"   Required: {'Yes' if required else 'No'}\n"
-                    detail += f"   XPath: {xpath}\n"
-                    detail += f"   Example: {example}"
+                    detail = [
+                        f"{i + 1}. Field: '{label}'",
+                        f"   Type: {field_type}",
+                        f"   Required: {'Yes' if required else 'No'}",
+                        f"   XPath: {xpath}",
+                        f"   Example: {example}",
+                    ]
 
                     # Add options if available
-                    if field.get('options') and len(field.get('options')) > 0:
-                        options = ", ".join([opt.get('text') for opt in field.get('options')])
-                        detail += f"\n   Options: {options}"
+                    options = field.get('options')
+                    if options:
+                        detail.append("   Options: " + ", ".join(opt.get('text') for opt in options))
 
                     # Add radio options if available
-                    if field.get('radioOptions') and len(field.get('radioOptions')) > 0:
-                        options = ", ".join([opt.get('text') for opt in field.get('radioOptions')])
-                        detail += f"\n   Options: {options}"
+                    radio_options = field.get('radioOptions')
+                    if radio_options:
+                        detail.append("   Options: " + ", ".join(opt.get('text') for opt in radio_options))
 
-                    field_details.append(detail)
+                    field_details.append("\n".join(detail))
 
                 details_text = "\n\n".join(field_details)
                 form_info = f"Form field mapping on {result.get('title')}\n\n{details_text}"
 
+                self._remember_field_xpaths(url, fields)
+
                 # Display the mapping information
                 self.browser.chat_window.add_message(form_info, Role.WEB_BROWSER)
 
@@ -762,1231 +3016,178 @@ class WebViewAutomator:
                 Role.WEB_BROWSER
             )
 
+    def _remember_field_xpaths(self, url, fields):
+        """Cache the XPath of each mapped field for later fills on the same page"""
+        if not url:
+            return
+
+        for field in fields:
+            # A radio's XPath only leads to one option, not the one a value picks
+            if field.get('type') == 'radio':
+                continue
+
+            label = field.get('label') or field.get('name') or field.get('id')
+            xpath = field.get('xpath')
+            if label and xpath:
+                key = (url, label.lower())
+                self._xpath_cache[key] = xpath
+                self._xpath_cache.move_to_end(key)
+
+        while len(self._xpath_cache) > self.XPATH_CACHE_SIZE:
+            self._xpath_cache.popitem(last=False)
+
     def fill_by_xpath(self, xpath_data):
         """Fill form fields using direct XPath selectors"""
-        for xpath, value in xpath_data.items():
-            js_script = f"""
-            (function() {{
-                try {{
-                    // Find the element by XPath
-                    function getElementByXPath(xpath) {{
-                        return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-                    }}
-
-                    // Get the element
-                    const element = getElementByXPath('{xpath}');
-                    if (!element) {{
-                        return {{ success: false, message: `Element not found by XPath: {xpath}` }};
-                    }}
-
-                    // Focus the element
-                    element.focus();
-
-                    // Handle different element types
-                    if (element.tagName === 'SELECT') {{
-                        // Handle select dropdowns
-                        let optionFound = false;
-
-                        for (const option of element.options) {{
-                            if (option.text.toLowerCase().includes('{value}'.toLowerCase()) || 
-                                option.value.toLowerCase() === '{value}'.toLowerCase()) {{
-                                element.value = option.value;
-                                optionFound = true;
-                                break;
-                            }}
-                        }}
-
-                        if (optionFound) {{
-                            element.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        }} else {{
-                            return {{ success: false, message: `Option '{value}' not found in dropdown` }};
-                        }}
-                    }}
-                    else if (element.type === 'checkbox' || element.getAttribute('role') === 'checkbox') {{
-                        // Handle checkboxes
-                        if ('{value}'.toLowerCase() === 'true' || 
-                            '{value}'.toLowerCase() === 'yes' || 
-                            '{value}'.toLowerCase() === 'checked' || 
-                            '{value}'.toLowerCase() === 'on') {{
-                            if (!element.checked) {{
-                                element.click();
-                            }}
-                        }} else if ('{value}'.toLowerCase() === 'false' || 
-                                    '{value}'.toLowerCase() === 'no' || 
-                                    '{value}'.toLowerCase() === 'unchecked' || 
-                                    '{value}'.toLowerCase() === 'off') {{
-                            if (element.checked) {{
-                                element.click();
-                            }}
-                        }} else {{
-                            element.click();
-                        }}
-                    }}
-                    else if (element.type === 'radio' || element.getAttribute('role') === 'radio') {{
-                        // Simply click radio buttons
-                        element.click();
-                    }}
-                    else {{
-                        // Handle text inputs
-                        if (element.value !== undefined) {{
-                            // Clear existing value
-                            element.value = '';
-                            element.dispatchEvent(new Event('input', {{ bubbles: true }}));
-
-                            // Set new value
-                            element.value = '{value}';
-                            element.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                        }}
-                        else if (element.getAttribute('contenteditable') === 'true') {{
-                            // Handle contenteditable
-                            element.textContent = '{value}';
-                            element.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                        }}
-                    }}
-
-                    // Dispatch events
-                    if (element.tagName !== 'SELECT') {{
-                        element.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                    }}
-
-                    element.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                    element.dispatchEvent(new Event('blur', {{ bubbles: true }}));
-
-                    return {{ 
-                        success: true, 
-                        xpath: '{xpath}',
-                        value: '{value}'
-                    }};
-                }} catch (e) {{
-                    return {{ 
-                        success: false, 
-                        message: `Error filling by XPath: ${{e.message}}`,
-                        xpath: '{xpath}'
-                    }};
-                }}
-            }})();
-            """
-
-            self.web_view.page().runJavaScript(js_script, self._handle_xpath_fill_result)
-
-    def _handle_xpath_fill_result(self, result):
-        """Handle the result of an XPath fill operation"""
-        if result.get('success'):
-            self.browser.chat_window.add_message(
-                f"✓ Filled field by XPath: {result.get('xpath')}\n" +
-                f"  Value: {result.get('value')}",
-                Role.WEB_BROWSER
-            )
-        else:
-            self.browser.chat_window.add_message(
-                f"✗ Failed to fill by XPath: {result.get('message')}",
-                Role.WEB_BROWSER
-            )
+        if not xpath_data:
+            return
+
+        # All fields go over in one call. JSON-encoding the pairs keeps quotes and
+        # newlines in values from breaking the script.
+        entries = [[xpath, str(value)] for xpath, value in xpath_data.items()]
+        self.web_view.page().runJavaScript(
+            f"window.__sage.fillByXPathBatch({json.dumps(entries)})",
+            QWebEngineScript.ScriptWorldId.ApplicationWorld.value,
+            self._handle_xpath_batch_result
+        )
+
+    def _handle_xpath_batch_result(self, results):
+        """Handle the results of a batch of XPath fill operations"""
+        lines = []
+        for result in results or []:
+            if result.get('success'):
+                lines.append(
+                    f"✓ Filled field by XPath: {result.get('xpath')}\n"
+                    f"  Value: {result.get('value')}"
+                )
+            else:
+                lines.append(f"✗ Failed to fill by XPath: {result.get('message')}")
+
+        if lines:
+            self._post_message("\n".join(lines))
 
     def fill_form(self, field_data):
         """Improved universal form field finder and filler with better field identification"""
-        for field, value in field_data.items():
-            js_script = f"""
-            (function() {{
-                // Universal form field finder with improved accuracy
-                function findFormField(fieldText) {{
-                    let foundElements = [];
-                    const fieldLower = fieldText.toLowerCase();
-
-                    // STRATEGY 1: Find by exact field label match
-                    const textElements = document.querySelectorAll('label, h1, h2, h3, h4, h5, h6, p, span, div, legend, [role="heading"]');
-                    for (const el of textElements) {{
-                        // Skip invisible elements
-                        if (!isVisible(el)) continue;
-
-                        // Check for EXACT matches first (highest priority)
-                        const trimmedContent = el.textContent.trim();
-                        if (trimmedContent.toLowerCase() === fieldLower) {{
-                            // We found an exact match! Now find its input
-
-                            // If it's a label with 'for' attribute
-                            if (el.tagName === 'LABEL' && el.htmlFor) {{
-                                const input = document.getElementById(el.htmlFor);
-                                if (input && isInputElement(input)) {{
-                                    foundElements.push({{ element: input, method: 'exact_label_match', score: 100 }});
-                                    // Exact match is so good we can return immediately
-                                    return {{ element: input, method: 'exact_label_match', score: 100 }};
-                                }}
-                            }}
-
-                            // Look for input in the same section
-                            const section = findCommonContainer(el);
-                            if (section) {{
-                                const inputs = section.querySelectorAll('input, textarea, select, [role="radio"], [role="checkbox"], [contenteditable="true"]');
-                                if (inputs.length > 0) {{
-                                    // If there's only one input, it's almost certainly the right one
-                                    if (inputs.length === 1) {{
-                                        foundElements.push({{ element: inputs[0], method: 'exact_text_match_single_input', score: 99 }});
-                                    }} else {{
-                                        // Multiple inputs, find closest one that's not a radio/checkbox
-                                        // or take first input as fallback
-                                        const textInputs = Array.from(inputs).filter(input => 
-                                            !['radio', 'checkbox'].includes(input.type) && 
-                                            input.getAttribute('role') !== 'radio' &&
-                                            input.getAttribute('role') !== 'checkbox');
-
-                                        if (textInputs.length > 0) {{
-                                            const closestInput = textInputs[0]; // First is often correct in forms
-                                            foundElements.push({{ element: closestInput, method: 'exact_text_match_multi_input', score: 95 }});
-                                        }} else {{
-                                            foundElements.push({{ element: inputs[0], method: 'exact_text_match_fallback', score: 90 }});
-                                        }}
-                                    }}
-                                }}
-                            }}
-                        }}
-                    }}
-
-                    // STRATEGY 2: Find field by visual proximity to matching label text
-                    // This is crucial for finding fields in complex forms
-                    for (const el of textElements) {{
-                        if (!isVisible(el)) continue;
-
-                        // Check for containing matches
-                        const trimmedContent = el.textContent.trim();
-                        if (trimmedContent.toLowerCase().includes(fieldLower) && 
-                            !foundElements.some(f => f.score > 90)) {{ // Skip if we already have very good matches
-
-                            // Check if this is a heading element
-                            const isHeading = /^H[1-6]$/.test(el.tagName) || 
-                                             el.getAttribute('role') === 'heading' ||
-                                             window.getComputedStyle(el).fontWeight >= 600;
-
-                            // Find the form section containing this label
-                            const section = findCommonContainer(el);
-                            if (section) {{
-                                // Get all inputs within this section
-                                const allInputs = section.querySelectorAll(
-                                    'input, textarea, select, [role="radio"], [role="checkbox"], [contenteditable="true"]'
-                                );
-
-                                if (allInputs.length > 0) {{
-                                    // Calculate visual position of the label
-                                    const labelRect = el.getBoundingClientRect();
-
-                                    // Get inputs positioned below this label (form fields are typically below labels)
-                                    // or get all inputs if no inputs found below
-                                    let relevantInputs = Array.from(allInputs).filter(input => {{
-                                        const inputRect = input.getBoundingClientRect();
-                                        return inputRect.top >= labelRect.bottom || // input is below label
-                                               (inputRect.bottom >= labelRect.top && inputRect.top <= labelRect.bottom); // input overlaps label
-                                    }});
-
-                                    // If no inputs found below, consider all inputs in the section
-                                    if (relevantInputs.length === 0) {{
-                                        relevantInputs = Array.from(allInputs);
-                                    }}
-
-                                    // Filter out hidden inputs
-                                    relevantInputs = relevantInputs.filter(input => isVisible(input));
-
-                                    if (relevantInputs.length > 0) {{
-                                        // If there's only one input, it's very likely the correct field
-                                        if (relevantInputs.length === 1) {{
-                                            const score = isHeading ? 94 : 88; // Headings are more reliable
-                                            foundElements.push({{ 
-                                                element: relevantInputs[0], 
-                                                method: 'single_field_section', 
-                                                score: score
-                                            }});
-                                        }}
-                                        // For multiple inputs, find the closest one vertically and horizontally
-                                        else {{
-                                            // Score each input by its position relative to the label
-                                            const scoredInputs = relevantInputs.map(input => {{
-                                                const inputRect = input.getBoundingClientRect();
-
-                                                // Calculate vertical and horizontal distance
-                                                const verticalDist = Math.abs(inputRect.top - labelRect.bottom);
-                                                const horizontalOverlap = Math.max(0, 
-                                                    Math.min(inputRect.right, labelRect.right) - 
-                                                    Math.max(inputRect.left, labelRect.left)
-                                                );
-
-                                                // Check if input is a text field (preferred over radio/checkbox)
-                                                const isTextField = input.tagName === 'INPUT' && 
-                                                                  !['radio', 'checkbox'].includes(input.type);
-
-                                                // Calculate score based on positioning and input type
-                                                // Lower vertical distance is better, horizontal overlap is good
-                                                let posScore = (1000 - verticalDist) + (horizontalOverlap > 0 ? 200 : 0);
-
-                                                // Prefer text fields to radio/checkbox for most field names
-                                                // Unless the field name suggests boolean/multiple choice
-                                                const isBooleanField = /yes|no|agree|disagree|accept|true|false/i.test(fieldLower);
-                                                if (isTextField && !isBooleanField) posScore += 300;
-
-                                                return {{ input, posScore }};
-                                            }});
-
-                                            // Sort by score
-                                            scoredInputs.sort((a, b) => b.posScore - a.posScore);
-
-                                            // Take the best match
-                                            if (scoredInputs.length > 0) {{
-                                                const bestInput = scoredInputs[0].input;
-                                                const score = isHeading ? 92 : 86; // Headings are more reliable
-                                                foundElements.push({{ 
-                                                    element: bestInput, 
-                                                    method: 'positioned_field', 
-                                                    score: score
-                                                }});
-                                            }}
-                                        }}
-                                    }}
-                                }}
-                            }}
-                        }}
-                    }}
-
-                    // STRATEGY 3: Find field by direct selectors (ID, name, placeholder)
-                    // This works well for properly semantic forms
-                    const directSelectors = [
-                        // Exact matches
-                        `#${{fieldText}}`,                        // id exactly matches
-                        `[name="${{fieldText}}"]`,                // name exactly matches
-                        `[placeholder="${{fieldText}}"]`,         // placeholder exactly matches
-                        `[aria-label="${{fieldText}}"]`,          // aria-label exactly matches
-
-                        // Contains matches (case insensitive)
-                        `[id*="${{fieldText}}" i]`,               // id contains
-                        `[name*="${{fieldText}}" i]`,             // name contains
-                        `input[placeholder*="${{fieldText}}" i]`, // placeholder contains
-                        `[aria-label*="${{fieldText}}" i]`        // aria-label contains
-                    ];
-
-                    for (const selector of directSelectors) {{
-                        try {{
-                            const element = document.querySelector(selector);
-                            if (element && isInputElement(element) && isVisible(element)) {{
-                                // Determine score based on match type
-                                let score = 85;
-                                if (selector.includes('*=')) {{
-                                    score = 75; // Partial matches are less reliable
-                                }}
-
-                                // Exact ID match is very reliable
-                                if (selector === `#${{fieldText}}`) score = 98;
-
-                                foundElements.push({{ element, method: 'direct_selector', score: score }});
-                            }}
-                        }} catch (e) {{
-                            // Invalid selector, continue
-                        }}
-                    }}
-
-                    // STRATEGY 4: Special case for complex forms like Google Forms
-                    // Look for headings/questions and their associated inputs
-                    const allHeadings = document.querySelectorAll('.M7eMe, [role="heading"], .freebirdFormviewerViewItemsItemItemTitle, h1, h2, h3, h4, h5');
-                    for (const heading of allHeadings) {{
-                        if (!isVisible(heading)) continue;
-
-                        const headingText = heading.textContent.trim();
-                        if (headingText.toLowerCase().includes(fieldLower)) {{
-                            // For Google Forms, we need to find the container with the input
-                            let container = heading;
-                            while (container && 
-                                   !container.classList.contains('Qr7Oae') &&
-                                   !container.classList.contains('freebirdFormviewerViewItemsItemItem') &&
-                                   container.tagName !== 'BODY') {{
-                                container = container.parentElement;
-                            }}
-
-                            if (container) {{
-                                // Google Form inputs often have these classes
-                                const googleInputs = container.querySelectorAll('.whsOnd, .rFrNMe input, [role="radio"], [role="checkbox"]');
-
-                                if (googleInputs.length > 0) {{
-                                    // Prefer text inputs unless field suggests radio/checkbox
-                                    const isBooleanField = /yes|no|agree|disagree|accept|true|false/i.test(fieldLower);
-
-                                    let bestInput;
-                                    if (isBooleanField) {{
-                                        // For boolean fields, prefer radio/checkboxes
-                                        bestInput = Array.from(googleInputs).find(el => 
-                                            el.type === 'radio' || 
-                                            el.type === 'checkbox' || 
-                                            el.getAttribute('role') === 'radio' ||
-                                            el.getAttribute('role') === 'checkbox'
-                                        ) || googleInputs[0];
-                                    }} else {{
-                                        // For text fields, prefer text inputs
-                                        bestInput = Array.from(googleInputs).find(el => 
-                                            el.type === 'text' || 
-                                            el.type === 'email' || 
-                                            el.tagName === 'TEXTAREA'
-                                        ) || googleInputs[0];
-                                    }}
-
-                                    foundElements.push({{ 
-                                        element: bestInput, 
-                                        method: 'google_form_pattern', 
-                                        score: 96  // Very reliable for Google Forms
-                                    }});
-                                }}
-                            }}
-                        }}
-                    }}
-
-                    // STRATEGY 5: Positional strategy for forms with no labels
-                    // This is a last resort for poorly designed forms
-                    if (foundElements.length === 0) {{
-                        const allVisibleInputs = Array.from(document.querySelectorAll('input, textarea, select'))
-                            .filter(el => isVisible(el));
-
-                        // Create a simple mapping of input positions to potential field names
-                        const fieldNames = extractPotentialFieldNames();
-
-                        // Find field index
-                        const fieldIndex = fieldNames.findIndex(name => 
-                            name.toLowerCase() === fieldLower ||
-                            name.toLowerCase().includes(fieldLower)
-                        );
-
-                        if (fieldIndex >= 0 && fieldIndex < allVisibleInputs.length) {{
-                            foundElements.push({{ 
-                                element: allVisibleInputs[fieldIndex], 
-                                method: 'positional', 
-                                score: 60  // Low confidence
-                            }});
-                        }}
-                    }}
-
-                    // Sort by score (highest first) and return best match
-                    foundElements.sort((a, b) => b.score - a.score);
-
-                    if (foundElements.length > 0) {{
-                        return foundElements[0];
-                    }}
-
-                    return {{ element: null, method: 'none', score: 0 }};
-                }}
-
-                // Extract potential field names from visible text
-                function extractPotentialFieldNames() {{
-                    const potentialLabels = [];
-                    const textElements = document.querySelectorAll('label, h1, h2, h3, h4, h5, h6, p, span, div, legend');
-
-                    for (const el of textElements) {{
-                        if (isVisible(el) && el.textContent.trim()) {{
-                            potentialLabels.push(el.textContent.trim());
-                        }}
-                    }}
-
-                    return potentialLabels;
-                }}
-
-                // Find the common container for a form element
-                function findCommonContainer(element) {{
-                    let current = element;
-
-                    // First look for standard form containers
-                    while (current && current.tagName !== 'BODY') {{
-                        // Standard form containers
-                        if (current.tagName === 'FORM' || 
-                            current.tagName === 'FIELDSET' ||
-                            current.classList.contains('form-group') ||
-                            current.classList.contains('form-field') ||
-                            current.classList.contains('field-container') ||
-                            current.classList.contains('input-group') ||
-                            current.getAttribute('role') === 'group') {{
-                            return current;
-                        }}
-
-                        // Google Forms specific containers
-                        if (current.classList.contains('Qr7Oae') ||
-                            current.classList.contains('freebirdFormviewerViewItemsItemItem') ||
-                            current.classList.contains('geS5n')) {{
-                            return current;
-                        }}
-
-                        // Look for any container with both text and input
-                        const hasText = !!current.textContent.trim();
-                        const hasInput = !!current.querySelector('input, textarea, select, [role="radio"]');
-
-                        if (hasText && hasInput && current.children.length < 15) {{
-                            return current;
-                        }}
-
-                        current = current.parentElement;
-                    }}
-
-                    // Fallback to nearest common container with other inputs
-                    current = element;
-                    while (current && current.tagName !== 'BODY') {{
-                        if (current.querySelectorAll('input, textarea, select').length > 0) {{
-                            return current;
-                        }}
-
-                        current = current.parentElement;
-                    }}
-
-                    return element.parentElement;
-                }}
-
-                // Check if element is a valid input element
-                function isInputElement(element) {{
-                    if (!element) return false;
-
-                    // Standard form inputs
-                    if (element.tagName === 'INPUT' || 
-                        element.tagName === 'TEXTAREA' || 
-                        element.tagName === 'SELECT') return true;
-
-                    // ARIA roles
-                    const role = element.getAttribute('role');
-                    if (role === 'textbox' || role === 'combobox' || 
-                        role === 'radio' || role === 'checkbox') return true;
-
-                    // Contenteditable
-                    if (element.getAttribute('contenteditable') === 'true') return true;
-
-                    return false;
-                }}
-
-                // Check if element is visible
-                function isVisible(element) {{
-                    if (!element) return false;
-
-                    // Get computed style
-                    const style = window.getComputedStyle(element);
-                    if (style.display === 'none' || 
-                        style.visibility === 'hidden' || 
-                        style.opacity === '0') {{
-                        return false;
-                    }}
-
-                    // Check dimensions
-                    const rect = element.getBoundingClientRect();
-                    if (rect.width === 0 || rect.height === 0) {{
-                        return false;
-                    }}
-
-                    return true;
-                }}
-
-                // MAIN EXECUTION LOGIC
-                // Find the element
-                const result = findFormField('{field}');
-                if (!result.element) {{
-                    return {{ success: false, message: `Could not find field: {field}` }};
-                }}
-
-                // Make element visible and in view
-                if (result.element.scrollIntoView) {{
-                    result.element.scrollIntoView({{ behavior: 'auto', block: 'center' }});
-                }}
-
-                // Focus and click the element
-                result.element.focus();
-
-                try {{
-                    // Handle different element types
-                    const element = result.element;
-
-                    if (element.tagName === 'SELECT') {{
-                        // Handle select dropdowns
-                        let optionFound = false;
-
-                        for (const option of element.options) {{
-                            if (option.text.toLowerCase().includes('{value}'.toLowerCase()) || 
-                                option.value.toLowerCase() === '{value}'.toLowerCase()) {{
-                                element.value = option.value;
-                                optionFound = true;
-                                break;
-                            }}
-                        }}
-
-                        if (optionFound) {{
-                            element.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        }} else {{
-                            return {{ success: false, message: `Option '{value}' not found in dropdown` }};
-                        }}
-                    }}
-                    else if (element.type === 'checkbox' || 
-                             element.getAttribute('role') === 'checkbox') {{
-                        // Handle checkboxes
-                        if ('{value}'.toLowerCase() === 'true' || 
-                            '{value}'.toLowerCase() === 'yes' || 
-                            '{value}'.toLowerCase() === 'checked' || 
-                            '{value}'.toLowerCase() === 'on') {{
-                            // Check the box if not already checked
-                            if (!element.checked) {{
-                                element.click();
-                            }}
-                        }} else if ('{value}'.toLowerCase() === 'false' || 
-                                    '{value}'.toLowerCase() === 'no' || 
-                                    '{value}'.toLowerCase() === 'unchecked' || 
-                                    '{value}'.toLowerCase() === 'off') {{
-                            // Uncheck the box if checked
-                            if (element.checked) {{
-                                element.click();
-                            }}
-                        }} else {{
-                            // Default to clicking
-                            element.click();
-                        }}
-                    }}
-                    else if (element.type === 'radio' || 
-                             element.getAttribute('role') === 'radio') {{
-                        // For radio buttons, we need to handle group behavior
-                        // Try to find all radios in the same group
-                        let radioGroup;
-                        const name = element.name;
-
-                        if (name) {{
-                            // Find all radios with the same name
-                            radioGroup = document.querySelectorAll(`input[name="${{name}}"]`);
-                        }} else if (element.getAttribute('role') === 'radio') {{
-                            // Find all radio roles in the same container
-                            let container = element.closest('[role="radiogroup"]') || 
-                                           element.closest('.Qr7Oae') || 
-                                           element.closest('form') || 
-                                           document;
-                            radioGroup = container.querySelectorAll('[role="radio"]');
-                        }} else {{
-                            // Just click this specific radio
-                            element.click();
-                            radioGroup = [element];
-                        }}
+        if not field_data:
+            return
 
-                        // If we want a specific value and have multiple radios
-                        if (radioGroup.length > 1 && '{value}' && 
-                            '{value}'.toLowerCase() !== 'true' && 
-                            '{value}'.toLowerCase() !== 'yes') {{
+        # Fields already mapped or filled on this page are filled straight by XPath
+        url = self.web_view.url().toString()
+        cached_fields = []
+        cached_entries = []
+        entries = []
+        for field, value in field_data.items():
+            xpath = self._xpath_cache.get((url, field.lower()))
+            if xpath:
+                cached_fields.append(field)
+                cached_entries.append([xpath, str(value)])
+            else:
+                entries.append([field, str(value)])
 
-                            let foundMatch = false;
+        if cached_entries:
+            self.web_view.page().runJavaScript(
+                f"window.__sage.fillByXPathBatch({json.dumps(cached_entries)})",
+                QWebEngineScript.ScriptWorldId.ApplicationWorld.value,
+                lambda results: self._handle_cached_fill_result(url, cached_fields, cached_entries, results)
+            )
+        if entries:
+            self._fill_form_chunk(url, entries)
 
-                            // Try to find radio by value, label, or aria-label
-                            for (const radio of radioGroup) {{
-                                // Check radio value
-                                if (radio.value && radio.value.toLowerCase() === '{value}'.toLowerCase()) {{
-                                    radio.click();
-                                    foundMatch = true;
-                                    break;
-                                }}
-
-                                // Check associated label
-                                let label = null;
-                                if (radio.id) {{
-                                    label = document.querySelector(`label[for="${{radio.id}}"]`);
-                                }} else {{
-                                    // Look for nearby or parent label
-                                    label = radio.closest('label') || 
-                                            Array.from(radio.parentElement.querySelectorAll('label')).find(l => 
-                                                l.textContent.toLowerCase().includes('{value}'.toLowerCase()));
-                                }}
-
-                                if (label && label.textContent.toLowerCase().includes('{value}'.toLowerCase())) {{
-                                    radio.click();
-                                    foundMatch = true;
-                                    break;
-                                }}
+    def _handle_cached_fill_result(self, url, fields, entries, results):
+        """Report fills by cached XPath, searching again for fields no longer there"""
+        if results is None:
+            self._post_message("⚠️ Error processing form fill result: received None")
+            return
 
-                                // Try to find by nearby text (Google Forms pattern)
-                                const container = radio.closest('.nWQGrd, .docssharedWizToggleLabeledContainer');
-                                if (container) {{
-                                    const text = container.textContent.toLowerCase();
-                                    if (text.includes('{value}'.toLowerCase())) {{
-                                        radio.click();
-                                        foundMatch = true;
-                                        break;
-                                    }}
-                                }}
-                            }}
-
-                            if (!foundMatch) {{
-                                // Default to the first radio if we couldn't find a match
-                                radioGroup[0].click();
-                            }}
-                        }} else {{
-                            // Default selection - just click this radio
-                            element.click();
-                        }}
-                    }}
-                    else {{
-                        // Handle text inputs
-                        if (element.value !== undefined) {{
-                            // Clear existing value
-                            element.value = '';
-                            element.dispatchEvent(new Event('input', {{ bubbles: true }}));
-
-                            // Set new value
-                            element.value = '{value}';
-                            element.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                        }}
-                        else if (element.getAttribute('contenteditable') === 'true') {{
-                            // Handle contenteditable
-                            element.textContent = '{value}';
-                            element.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                        }}
-                    }}
-
-                    // Final events for all field types
-                    if (element.tagName !== 'SELECT') {{
-                        element.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                    }}
-
-                    element.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                    element.dispatchEvent(new Event('blur', {{ bubbles: true }}));
-
-                    return {{ 
-                        success: true, 
-                        field: '{field}',
-                        method: result.method,
-                        score: result.score,
-                        value: '{value}'
-                    }};
-                }} catch (e) {{
-                    return {{ 
-                        success: false, 
-                        message: `Error filling field: ${{e.message}}`,
-                        field: '{field}'
-                    }};
-                }}
-            }})();
-            """
-
-            self.web_view.page().runJavaScript(js_script, self._handle_form_fill_result)
-
-    def _handle_form_fill_result(self, result):
-        """Handle the result of a form fill operation"""
-        # Check if result is None to avoid AttributeError
-        if result is None:
-            self.browser.chat_window.add_message(
-                f"⚠️ Error processing form fill result: received None",
-                Role.WEB_BROWSER
-            )
+        reported = []
+        retry = []
+        for field, (xpath, value), result in zip(fields, entries, results):
+            if result.get('missing'):
+                self._xpath_cache.pop((url, field.lower()), None)
+                retry.append([field, value])
+            else:
+                reported.append(result)
+
+        self._handle_xpath_batch_result(reported)
+        if retry:
+            self._fill_form_chunk(url, retry)
+
+    def _fill_form_chunk(self, url, entries):
+        """Fill the next chunk of fields, chaining the rest after its result"""
+        chunk = entries[:self.FILL_FORM_CHUNK_SIZE]
+        rest = entries[self.FILL_FORM_CHUNK_SIZE:]
+
+        # The fields in a chunk share one page scan
+        self.web_view.page().runJavaScript(
+            f"window.__sage.fillForm({json.dumps(chunk)})",
+            QWebEngineScript.ScriptWorldId.ApplicationWorld.value,
+            lambda results: self._handle_form_fill_chunk_result(url, results, rest)
+        )
+
+    def _handle_form_fill_chunk_result(self, url, results, rest):
+        # Remember where each field was found, so filling it again skips the search
+        if results:
+            self._remember_field_xpaths(url, [
+                {'label': result.get('field'), 'xpath': result.get('xpath')}
+                for result in results if result.get('success')
+            ])
+
+        self._handle_form_fill_batch_result(results)
+        if rest:
+            self._fill_form_chunk(url, rest)
+
+    def _handle_form_fill_batch_result(self, results):
+        """Handle the results of a batch of form fill operations"""
+        # Check if results is None to avoid TypeError
+        if results is None:
+            self._post_message(f"⚠️ Error processing form fill result: received None")
             return
 
-        if result.get('success'):
-            method = result.get('method', 'unknown')
-            field = result.get('field', '')
-            score = result.get('score', 'N/A')
+        lines = []
+        for result in results:
+            if result.get('success'):
+                method = result.get('method', 'unknown')
+                field = result.get('field', '')
+                score = result.get('score', 'N/A')
 
-            self.browser.chat_window.add_message(
-                f"✓ Filled field '{field}' (found by {method})\n" +
-                f"  Match confidence: {score}/100",
-                Role.WEB_BROWSER
-            )
-        else:
-            self.browser.chat_window.add_message(
-                f"✗ Failed to fill field '{result.get('field', '')}': {result.get('message', 'Unknown error')}",
-                Role.WEB_BROWSER
-            )
+                lines.append(
+                    f"✓ Filled field '{field}' (found by {method})\n"
+                    f"  Match confidence: {score}/100"
+                )
+            else:
+                lines.append(
+                    f"✗ Failed to fill field '{result.get('field', '')}': {result.get('message', 'Unknown error')}"
+                )
+
+        if lines:
+            self._post_message("\n".join(lines))
 
     def select_option(self, selector, value):
         """Select an option from a dropdown select element"""
-        js_script = f"""
-        (function() {{
-            try {{
-                // Function to get XPath of an element
-                function getXPath(element) {{
-                    if (!element) return "/none";
-                    if (element.id) return `//*[@id="${{element.id}}"]`;
-
-                    let path = '';
-                    let current = element;
-
-                    while (current && current.nodeType === 1) {{
-                        let index = 1;
-                        let sibling = current.previousSibling;
-
-                        while (sibling) {{
-                            if (sibling.nodeType === 1 && sibling.tagName === current.tagName) {{
-                                index++;
-                            }}
-                            sibling = sibling.previousSibling;
-                        }}
-
-                        const tagName = current.tagName.toLowerCase();
-                        const pathIndex = (index > 1) ? `[${{index}}]` : '';
-                        path = `/${{tagName}}${{pathIndex}}${{path}}`;
-
-                        current = current.parentNode;
-                        if (!current || current.tagName === 'BODY' || current === document) break;
-                    }}
-
-                    return path || "/unknown";
-                }}
-
-                // Helper function to find elements by various attributes
-                function findElement(selector) {{
-                    // Try direct CSS selector first
-                    try {{
-                        const element = document.querySelector(selector);
-                        if (element) return {{ element, method: 'css_selector' }};
-                    }} catch (e) {{
-                        // Invalid selector, continue with other methods
-                    }}
-
-                    // Try by ID
-                    const elementById = document.getElementById(selector);
-                    if (elementById) return {{ element: elementById, method: 'id' }};
-
-                    // Try by name attribute
-                    const elementByName = document.querySelector(`[name="${{selector}}"]`);
-                    if (elementByName) return {{ element: elementByName, method: 'name' }};
-
-                    // Try by label text
-                    const labels = Array.from(document.querySelectorAll('label'));
-                    for (const label of labels) {{
-                        if (label.textContent.toLowerCase().includes(selector.toLowerCase())) {{
-                            if (label.htmlFor) {{
-                                const elementByLabel = document.getElementById(label.htmlFor);
-                                if (elementByLabel) return {{ element: elementByLabel, method: 'label' }};
-                            }}
-                        }}
-                    }}
-
-                    // Try by placeholder
-                    const elementByPlaceholder = document.querySelector(`[placeholder*="${{selector}}" i]`);
-                    if (elementByPlaceholder) return {{ element: elementByPlaceholder, method: 'placeholder' }};
-
-                    return {{ element: null, method: 'none' }};
-                }}
-
-                // Find the select element
-                const result = findElement('{selector}');
-                if (!result.element || result.element.tagName !== 'SELECT') {{
-                    return {{ 
-                        success: false, 
-                        message: `Could not find select element with selector: ${{{selector}}}`
-                    }};
-                }}
-
-                const select = result.element;
-                const xpath = getXPath(select);
-                let optionFound = false;
-                let selectedText = '';
-
-                // Try to find the option by value, text content, or index
-                if ('{value}'.match(/^\\d+$/)) {{
-                    // If value is a number, try to select by index
-                    const index = parseInt('{value}');
-                    if (index >= 0 && index < select.options.length) {{
-                        select.selectedIndex = index;
-                        optionFound = true;
-                        selectedText = select.options[index].text;
-                    }}
-                }}
-
-                // If not found by index or value is not a number, try value and text
-                if (!optionFound) {{
-                    for (let i = 0; i < select.options.length; i++) {{
-                        const option = select.options[i];
-
-                        // Try exact value match
-                        if (option.value === '{value}') {{
-                            select.selectedIndex = i;
-                            optionFound = true;
-                            selectedText = option.text;
-                            break;
-                        }}
-
-                        // Try case-insensitive text content match
-                        if (option.text.toLowerCase() === '{value}'.toLowerCase()) {{
-                            select.selectedIndex = i;
-                            optionFound = true;
-                            selectedText = option.text;
-                            break;
-                        }}
-
-                        // Try contains text match
-                        if (option.text.toLowerCase().includes('{value}'.toLowerCase())) {{
-                            select.selectedIndex = i;
-                            optionFound = true;
-                            selectedText = option.text;
-                            break;
-                        }}
-                    }}
-                }}
-
-                // Dispatch change event
-                if (optionFound) {{
-                    select.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                    return {{ 
-                        success: true, 
-                        method: result.method,
-                        xpath: xpath,
-                        selectedText: selectedText,
-                        selectedValue: select.value
-                    }};
-                }}
-
-                return {{ 
-                    success: false, 
-                    message: `Option "${{'{value}'"}}" not found in select element` 
-                }};
-            }} catch (e) {{
-                return {{ 
-                    success: false, 
-                    message: `Error selecting option: ${{e.message}}` 
-                }};
-            }}
-        }})();
-        """
-
-        self.web_view.page().runJavaScript(js_script, self._handle_select_option_result)
+        self.web_view.page().runJavaScript(
+            f"window.__sage.selectOption({json.dumps(str(selector))}, {json.dumps(str(value))})",
+            QWebEngineScript.ScriptWorldId.ApplicationWorld.value,
+            self._handle_select_option_result
+        )
 
     def _handle_select_option_result(self, result):
         """Handle the result of a select option operation"""
         if result.get('success'):
-            self.browser.chat_window.add_message(
-                f"✓ Selected option '{result.get('selectedText')}' (value: {result.get('selectedValue')})\n" +
-                f"  Found by: {result.get('method')}\n" +
-                f"  XPath: {result.get('xpath')}",
-                Role.WEB_BROWSER
+            self._post_message(
+                f"✓ Selected option '{result.get('selectedText')}' (value: {result.get('selectedValue')})\n"
+                f"  Found by: {result.get('method')}\n"
+                f"  XPath: {result.get('xpath')}"
             )
         else:
-            self.browser.chat_window.add_message(
-                f"✗ Failed to select option: {result.get('message')}",
-                Role.WEB_BROWSER
-            )
+            self._post_message(f"✗ Failed to select option: {result.get('message')}")
 
     def check_radio(self, selector, value=None):
         """Select a radio button with universal support for various form types"""
-        js_script = f"""
-        (function() {{
-            try {{
-                // Function to get XPath of an element
-                function getXPath(element) {{
-                    if (!element) return "/none";
-                    if (element.id) return `//*[@id="${{element.id}}"]`;
-
-                    let path = '';
-                    let current = element;
-
-                    while (current && current.nodeType === 1) {{
-                        let index = 1;
-                        let sibling = current.previousSibling;
-
-                        while (sibling) {{
-                            if (sibling.nodeType === 1 && sibling.tagName === current.tagName) {{
-                                index++;
-                            }}
-                            sibling = sibling.previousSibling;
-                        }}
-
-                        const tagName = current.tagName.toLowerCase();
-                        const pathIndex = (index > 1) ? `[${{index}}]` : '';
-                        path = `/${{tagName}}${{pathIndex}}${{path}}`;
-
-                        current = current.parentNode;
-                        if (!current || current.tagName === 'BODY' || current === document) break;
-                    }}
-
-                    return path || "/unknown";
-                }}
-
-                // Helper function to check if an element is visible
-                function isVisible(element) {{
-                    if (!element) return false;
-                    const style = window.getComputedStyle(element);
-                    return style.display !== 'none' && 
-                           style.visibility !== 'hidden' && 
-                           element.offsetParent !== null &&
-                           element.getBoundingClientRect().width > 0 && 
-                           element.getBoundingClientRect().height > 0;
-                }}
-
-                // Strategy 1: Find by question text first
-                const potentialQuestionElements = document.querySelectorAll(
-                    '[role="heading"], h1, h2, h3, h4, h5, h6, legend, label, p, span, div'
-                );
-
-                let formSection = null;
-
-                // Find the section containing our question
-                for (const element of potentialQuestionElements) {{
-                    if (!isVisible(element)) continue;
-
-                    if (element.textContent.toLowerCase().includes('{selector}'.toLowerCase())) {{
-                        // Found question text, now find the container
-                        let section = element;
-                        let radioFound = false;
-
-                        // Look up the DOM tree for a container with radio buttons
-                        for (let i = 0; i < 10; i++) {{ // Maximum of 10 parent levels to search
-                            // Check if current section contains radio buttons
-                            const radios = section.querySelectorAll('input[type="radio"], [role="radio"]');
-                            if (radios.length > 0) {{
-                                formSection = section;
-                                radioFound = true;
-                                break;
-                            }}
-
-                            // Move up to parent if it exists and isn't the body element
-                            if (section.parentElement && section.parentElement !== document.body) {{
-                                section = section.parentElement;
-                            }} else {{
-                                break;
-                            }}
-                        }}
-
-                        // If we found radio buttons, no need to check other question elements
-                        if (radioFound) break;
-                    }}
-                }}
-
-                // If we found a section with radio buttons
-                if (formSection) {{
-                    // Find all radio containers/buttons
-                    const radioButtons = formSection.querySelectorAll('input[type="radio"], [role="radio"]');
-                    const radioContainers = Array.from(formSection.querySelectorAll('label, div'))
-                        .filter(el => el.querySelector('input[type="radio"], [role="radio"]'));
-
-                    // If we have radio buttons
-                    if (radioButtons.length > 0 || radioContainers.length > 0) {{
-                        // If option value is provided, try to match it
-                        if ('{value}') {{
-                            // Method 1: Try matching by container text first
-                            for (const container of radioContainers) {{
-                                if (!isVisible(container)) continue;
-
-                                const containerText = container.textContent.trim().toLowerCase();
-                                if (containerText.includes('{value}'.toLowerCase())) {{
-                                    // Find the actual radio element
-                                    const radio = container.querySelector('input[type="radio"], [role="radio"]') || container;
-
-                                    // Get XPath before clicking
-                                    const xpath = getXPath(radio);
-
-                                    // Click the element
-                                    radio.click();
-
-                                    return {{
-                                        success: true,
-                                        method: 'container_text_match',
-                                        xpath: xpath,
-                                        value: '{value}',
-                                        labelText: containerText
-                                    }};
-                                }}
-                            }}
-
-                            // Method 2: Try matching directly by radio button value or nearby text
-                            for (const radio of radioButtons) {{
-                                if (!isVisible(radio)) continue;
-
-                                // Check radio value
-                                if (radio.value && radio.value.toLowerCase() === '{value}'.toLowerCase()) {{
-                                    const xpath = getXPath(radio);
-                                    radio.click();
-
-                                    return {{
-                                        success: true,
-                                        method: 'value_match',
-                                        xpath: xpath,
-                                        value: '{value}'
-                                    }};
-                                }}
-
-                                // Check nearby text
-                                let radioLabel = null;
-
-                                // Try to find associated label by 'for' attribute
-                                if (radio.id) {{
-                                    radioLabel = document.querySelector(`label[for="${{radio.id}}"]`);
-                                }}
-
-                                // Try to find parent label
-                                if (!radioLabel) {{
-                                    radioLabel = radio.closest('label');
-                                }}
-
-                                // Try to find sibling or nearby text
-                                if (!radioLabel) {{
-                                    const parent = radio.parentElement;
-                                    if (parent) {{
-                                        const nearbyText = parent.textContent.trim();
-                                        if (nearbyText.toLowerCase().includes('{value}'.toLowerCase())) {{
-                                            const xpath = getXPath(radio);
-                                            radio.click();
-
-                                            return {{
-                                                success: true,
-                                                method: 'nearby_text_match',
-                                                xpath: xpath,
-                                                value: '{value}',
-                                                text: nearbyText
-                                            }};
-                                        }}
-                                    }}
-                                }}
-
-                                // If we found a label, check its text
-                                if (radioLabel && radioLabel.textContent.trim().toLowerCase().includes('{value}'.toLowerCase())) {{
-                                    const xpath = getXPath(radio);
-                                    radio.click();
-
-                                    return {{
-                                        success: true,
-                                        method: 'label_text_match',
-                                        xpath: xpath,
-                                        value: '{value}',
-                                        labelText: radioLabel.textContent.trim()
-                                    }};
-                                }}
-                            }}
-                        }}
-
-                        // If value not provided or no match found, select first radio button
-                        const firstRadio = radioButtons.length > 0 ? 
-                            radioButtons[0] : 
-                            radioContainers[0].querySelector('input[type="radio"], [role="radio"]') || radioContainers[0];
-
-                        if (firstRadio) {{
-                            const xpath = getXPath(firstRadio);
-                            firstRadio.click();
-
-                            return {{
-                                success: true,
-                                method: 'first_option',
-                                xpath: xpath,
-                                value: '{value}' ? `{value} (not found, selected first option)` : 'first option'
-                            }};
-                        }}
-                    }}
-                }}
-
-                // Strategy 2: Try by direct value matching if selector is a radio name
-                {{
-                    // Try to find by name attribute + value
-                    const radiosByName = document.querySelectorAll(`[name="${{{selector}}}"]`);
-                    if (radiosByName.length > 0) {{
-                        // If specific value provided
-                        if ('{value}') {{
-                            for (const radio of radiosByName) {{
-                                if (radio.type === 'radio' && radio.value === '{value}') {{
-                                    const radioXPath = getXPath(radio);
-                                    radio.checked = true;
-                                    radio.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                                    radio.click();
-
-                                    return {{ 
-                                        success: true, 
-                                        method: 'name_value_match',
-                                        xpath: radioXPath,
-                                        value: radio.value,
-                                        name: radio.name
-                                    }};
-                                }}
-                            }}
-                        }}
-
-                        // No matching value or no value provided, select first radio
-                        const firstRadio = radiosByName[0];
-                        if (firstRadio.type === 'radio') {{
-                            const radioXPath = getXPath(firstRadio);
-                            firstRadio.checked = true;
-                            firstRadio.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                            firstRadio.click();
-
-                            return {{ 
-                                success: true, 
-                                method: 'name_first_match',
-                                xpath: radioXPath,
-                                value: firstRadio.value,
-                                name: firstRadio.name
-                            }};
-                        }}
-                    }}
-                }}
-
-                // Strategy 3: Try by direct CSS selector
-                try {{
-                    const directRadio = document.querySelector('{selector}');
-                    if (directRadio && (directRadio.type === 'radio' || directRadio.getAttribute('role') === 'radio')) {{
-                        const radioXPath = getXPath(directRadio);
-
-                        if (directRadio.type === 'radio') {{
-                            directRadio.checked = true;
-                            directRadio.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        }}
-
-                        directRadio.click();
-
-                        return {{ 
-                            success: true, 
-                            method: 'direct_selector',
-                            xpath: radioXPath,
-                            value: directRadio.value || 'unknown'
-                        }};
-                    }}
-                }} catch (e) {{
-                    // Invalid selector, continue with other methods
-                }}
-
-                // Strategy 4: Try to find any radio group with matching question text in any form element
-                const radioGroups = document.querySelectorAll('fieldset, [role="radiogroup"], form, div');
-                for (const group of radioGroups) {{
-                    if (!isVisible(group)) continue;
-
-                    if (group.textContent.toLowerCase().includes('{selector}'.toLowerCase())) {{
-                        const radios = group.querySelectorAll('input[type="radio"], [role="radio"]');
-
-                        if (radios.length > 0) {{
-                            // If value provided, try to match
-                            if ('{value}') {{
-                                for (const radio of radios) {{
-                                    if (!isVisible(radio)) continue;
-
-                                    const radioContainer = radio.closest('label') || radio.parentElement;
-                                    const radioText = radioContainer ? radioContainer.textContent.trim() : '';
-
-                                    if (radio.value === '{value}' || 
-                                        radioText.toLowerCase().includes('{value}'.toLowerCase())) {{
-
-                                        const xpath = getXPath(radio);
-                                        radio.click();
-
-                                        return {{
-                                            success: true,
-                                            method: 'group_match',
-                                            xpath: xpath,
-                                            value: '{value}',
-                                            groupText: group.textContent.trim().substring(0, 100) + '...'
-                                        }};
-                                    }}
-                                }}
-                            }}
-
-                            // No match or no value, select first radio
-                            const firstRadio = radios[0];
-                            const xpath = getXPath(firstRadio);
-                            firstRadio.click();
-
-                            return {{
-                                success: true,
-                                method: 'group_first_option',
-                                xpath: xpath,
-                                value: '{value}' ? `{value} (not found, selected first option)` : 'first option',
-                                groupText: group.textContent.trim().substring(0, 100) + '...'
-                            }};
-                        }}
-                    }}
-                }}
-
-                return {{
-                    success: false,
-                    message: `Radio button not found for question: {selector}` + ('{value}' ? ` with value: {value}` : '')
-                }};
-            }} catch (e) {{
-                return {{
-                    success: false,
-                    message: `Error selecting radio option: ${{e.message}}`
-                }};
-            }}
-        }})();
-        """
-
-        self.web_view.page().runJavaScript(js_script, self._handle_check_radio_result)
+        value = "" if value is None else str(value)
+        self.web_view.page().runJavaScript(
+            f"window.__sage.checkRadio({json.dumps(str(selector))}, {json.dumps(value)})",
+            QWebEngineScript.ScriptWorldId.ApplicationWorld.value,
+            self._handle_check_radio_result
+        )
 
     def _handle_check_radio_result(self, result):
         """Handle the result of a radio button selection operation"""
@@ -1995,672 +3196,107 @@ class WebViewAutomator:
 
             # Google Forms specific methods
             if 'google_forms' in method:
-                self.browser.chat_window.add_message(
-                    f"✓ Selected Google Form radio option '{result.get('value')}'\n" +
-                    f"  Label: {result.get('labelText', 'N/A')}\n" +
-                    f"  Found by: {method}\n" +
-                    f"  XPath: {result.get('xpath')}",
-                    Role.WEB_BROWSER
+                self._post_message(
+                    f"✓ Selected Google Form radio option '{result.get('value')}'\n"
+                    f"  Label: {result.get('labelText', 'N/A')}\n"
+                    f"  Found by: {method}\n"
+                    f"  XPath: {result.get('xpath')}"
                 )
             # Generic selection by label
             elif 'label' in method or 'heading' in method or 'container' in method:
                 label_info = result.get('labelText') or result.get('containerText') or ''
-                self.browser.chat_window.add_message(
-                    f"✓ Selected radio button in '{label_info}'\n" +
-                    f"  Value: {result.get('value')}\n" +
-                    f"  Found by: {method}\n" +
-                    f"  XPath: {result.get('xpath')}",
-                    Role.WEB_BROWSER
+                self._post_message(
+                    f"✓ Selected radio button in '{label_info}'\n"
+                    f"  Value: {result.get('value')}\n"
+                    f"  Found by: {method}\n"
+                    f"  XPath: {result.get('xpath')}"
                 )
             # Direct selector methods
             else:
-                self.browser.chat_window.add_message(
-                    f"✓ Selected radio button\n" +
-                    f"  Value: {result.get('value')}\n" +
-                    f"  Name: {result.get('name', 'N/A')}\n" +
-                    f"  Found by: {method}\n" +
-                    f"  XPath: {result.get('xpath')}",
-                    Role.WEB_BROWSER
+                self._post_message(
+                    f"✓ Selected radio button\n"
+                    f"  Value: {result.get('value')}\n"
+                    f"  Name: {result.get('name', 'N/A')}\n"
+                    f"  Found by: {method}\n"
+                    f"  XPath: {result.get('xpath')}"
                 )
         else:
-            self.browser.chat_window.add_message(
-                f"✗ Failed to select radio button: {result.get('message')}",
-                Role.WEB_BROWSER
-            )
+            self._post_message(f"✗ Failed to select radio button: {result.get('message')}")
 
     def check_checkbox(self, selector, check=True):
         """Check or uncheck a checkbox"""
-        js_script = f"""
-        (function() {{
-            try {{
-                // Function to get XPath of an element
-                function getXPath(element) {{
-                    if (!element) return "/none";
-                    if (element.id) return `//*[@id="${{element.id}}"]`;
-
-                    let path = '';
-                    let current = element;
-
-                    while (current && current.nodeType === 1) {{
-                        let index = 1;
-                        let sibling = current.previousSibling;
-
-                        while (sibling) {{
-                            if (sibling.nodeType === 1 && sibling.tagName === current.tagName) {{
-                                index++;
-                            }}
-                            sibling = sibling.previousSibling;
-                        }}
-
-                        const tagName = current.tagName.toLowerCase();
-                        const pathIndex = (index > 1) ? `[${{index}}]` : '';
-                        path = `/${{tagName}}${{pathIndex}}${{path}}`;
-
-                        current = current.parentNode;
-                        if (!current || current.tagName === 'BODY' || current === document) break;
-                    }}
-
-                    return path || "/unknown";
-                }}
-
-                // Try various methods to find the checkbox
-                let checkbox = null;
-                let method = '';
-
-                // Method 1: Direct CSS selector
-                try {{
-                    checkbox = document.querySelector('{selector}');
-                    if (checkbox && checkbox.type === 'checkbox') {{
-                        method = 'css_selector';
-                    }}
-                }} catch (e) {{
-                    // Invalid selector, continue with other methods
-                }}
-
-                // Method 2: By ID
-                if (!checkbox || checkbox.type !== 'checkbox') {{
-                    checkbox = document.getElementById('{selector}');
-                    if (checkbox && checkbox.type === 'checkbox') {{
-                        method = 'id';
-                    }}
-                }}
-
-                // Method 3: By name
-                if (!checkbox || checkbox.type !== 'checkbox') {{
-                    const elements = document.getElementsByName('{selector}');
-                    for (const el of elements) {{
-                        if (el.type === 'checkbox') {{
-                            checkbox = el;
-                            method = 'name';
-                            break;
-                        }}
-                    }}
-                }}
-
-                // Method 4: By label text
-                if (!checkbox || checkbox.type !== 'checkbox') {{
-                    const labels = Array.from(document.querySelectorAll('label'));
-                    for (const label of labels) {{
-                        if (label.textContent.trim().toLowerCase().includes('{selector}'.toLowerCase())) {{
-                            if (label.htmlFor) {{
-                                const cb = document.getElementById(label.htmlFor);
-                                if (cb && cb.type === 'checkbox') {{
-                                    checkbox = cb;
-                                    method = 'label_text';
-                                    break;
-                                }}
-                            }} else {{
-                                const cb = label.querySelector('input[type="checkbox"]');
-                                if (cb) {{
-                                    checkbox = cb;
-                                    method = 'label_contains';
-                                    break;
-                                }}
-                            }}
-                        }}
-                    }}
-                }}
-
-                if (checkbox && checkbox.type === 'checkbox') {{
-                    const checkboxXPath = getXPath(checkbox);
-
-                    // Don't change state if already in desired state
-                    if (checkbox.checked !== {str(check).lower()}) {{
-                        checkbox.checked = {str(check).lower()};
-                        checkbox.dispatchEvent(new Event('change', {{ bubbles: true }}));
-
-                        // Also click for compatibility with some frameworks
-                        checkbox.click();
-                    }}
-
-                    const labelText = (() => {{
-                        // Try to find associated label text
-                        if (checkbox.id) {{
-                            const label = document.querySelector(`label[for="${{checkbox.id}}"]`);
-                            if (label) return label.textContent.trim();
-                        }}
-
-                        // Look for parent label
-                        let parent = checkbox.parentElement;
-                        while (parent && parent.tagName !== 'BODY') {{
-                            if (parent.tagName === 'LABEL') {{
-                                return parent.textContent.trim();
-                            }}
-                            parent = parent.parentElement;
-                        }}
-
-                        return '';
-                    }})();
-
-                    return {{ 
-                        success: true, 
-                        method: method,
-                        xpath: checkboxXPath,
-                        checked: checkbox.checked,
-                        label: labelText,
-                        id: checkbox.id || '',
-                        name: checkbox.name || ''
-                    }};
-                }}
-
-                return {{ 
-                    success: false, 
-                    message: `Checkbox not found with selector: ${{'{selector}'}}` 
-                }};
-            }} catch (e) {{
-                return {{ 
-                    success: false, 
-                    message: `Error checking checkbox: ${{e.message}}` 
-                }};
-            }}
-        }})();
-        """
-
-        self.web_view.page().runJavaScript(js_script, self._handle_check_checkbox_result)
+        self.web_view.page().runJavaScript(
+            f"window.__sage.checkCheckbox({json.dumps(str(selector))}, {json.dumps(bool(check))})",
+            QWebEngineScript.ScriptWorldId.ApplicationWorld.value,
+            self._handle_check_checkbox_result
+        )
 
     def _handle_check_checkbox_result(self, result):
         """Handle the result of a checkbox selection operation"""
         if result.get('success'):
             state = "Checked" if result.get('checked') else "Unchecked"
             label_info = f" '{result.get('label')}'" if result.get('label') else ""
-            self.browser.chat_window.add_message(
-                f"✓ {state} checkbox{label_info}\n" +
-                f"  Found by: {result.get('method')}\n" +
-                f"  ID: {result.get('id') or 'none'}\n" +
-                f"  Name: {result.get('name') or 'none'}\n" +
-                f"  XPath: {result.get('xpath')}",
-                Role.WEB_BROWSER
+            self._post_message(
+                f"✓ {state} checkbox{label_info}\n"
+                f"  Found by: {result.get('method')}\n"
+                f"  ID: {result.get('id') or 'none'}\n"
+                f"  Name: {result.get('name') or 'none'}\n"
+                f"  XPath: {result.get('xpath')}"
             )
         else:
-            self.browser.chat_window.add_message(
-                f"✗ Failed to set checkbox: {result.get('message')}",
-                Role.WEB_BROWSER
-            )
+            self._post_message(f"✗ Failed to set checkbox: {result.get('message')}")
 
     def click_custom_element(self, selector, attribute=None, value=None):
         """Click a custom element like a star rating, dropdown item, etc."""
-        js_script = f"""
-        (function() {{
-            try {{
-                // Function to get XPath of an element
-                function getXPath(element) {{
-                    if (!element) return "/none";
-                    if (element.id) return `//*[@id="${{element.id}}"]`;
-
-                    let path = '';
-                    let current = element;
-
-                    while (current && current.nodeType === 1) {{
-                        let index = 1;
-                        let sibling = current.previousSibling;
-
-                        while (sibling) {{
-                            if (sibling.nodeType === 1 && sibling.tagName === current.tagName) {{
-                                index++;
-                            }}
-                            sibling = sibling.previousSibling;
-                        }}
-
-                        const tagName = current.tagName.toLowerCase();
-                        const pathIndex = (index > 1) ? `[${{index}}]` : '';
-                        path = `/${{tagName}}${{pathIndex}}${{path}}`;
-
-                        current = current.parentNode;
-                        if (!current || current.tagName === 'BODY' || current === document) break;
-                    }}
-
-                    return path || "/unknown";
-                }}
-
-                let element = null;
-                let method = '';
-
-                // Try as CSS selector
-                try {{
-                    // If attribute and value provided, make a more specific selector
-                    if ('{attribute}' && '{value}') {{
-                        const attrSelector = `${{'{selector}'}}[${{'{attribute}'}}="${{'{value}'}}"]`;
-                        element = document.querySelector(attrSelector);
-                        if (element) {{
-                            method = 'attribute_selector';
-                        }}
-                    }} else {{
-                        element = document.querySelector('{selector}');
-                        if (element) {{
-                            method = 'css_selector';
-                        }}
-                    }}
-                }} catch (e) {{
-                    // Invalid selector, continue with other methods
-                }}
-
-                // Try by ID
-                if (!element) {{
-                    element = document.getElementById('{selector}');
-                    if (element) {{
-                        method = 'id';
-                    }}
-                }}
-
-                // For custom elements like star ratings, try to find by aria-label
-                if (!element && '{value}') {{
-                    element = document.querySelector(`[${{'{attribute}' || 'aria-label'}}="${{'{value}'}}"]`);
-                    if (element) {{
-                        method = 'aria_attribute';
-                    }}
-                }}
-
-                // Special handling for common patterns
-
-                // Star ratings (often buttons with star symbols)
-                if (!element && '{selector}'.toLowerCase().includes('star')) {{
-                    const stars = Array.from(document.querySelectorAll('button, [role="button"]')).filter(el => {{
-                        return el.textContent.includes('★') || 
-                               el.getAttribute('aria-label')?.toLowerCase().includes('star');
-                    }});
-
-                    // If value is a number 1-5, try to find that star
-                    if ('{value}' && stars.length > 0) {{
-                        const starValue = parseInt('{value}');
-                        if (!isNaN(starValue) && starValue > 0 && starValue <= stars.length) {{
-                            element = stars[starValue - 1];
-                            method = 'star_rating';
-                        }}
-                    }}
-                }}
-
-                // Find by text content if other methods fail
-                if (!element && '{value}') {{
-                    const allElements = document.querySelectorAll('{selector}' || '*');
-                    for (const el of allElements) {{
-                        if (el.textContent.trim().toLowerCase() === '{value}'.toLowerCase()) {{
-                            element = el;
-                            method = 'text_content';
-                            break;
-                        }}
-                    }}
-                }}
-
-                if (element) {{
-                    const elementXPath = getXPath(element);
-
-                    // Get useful information about the element
-                    const tagName = element.tagName.toLowerCase();
-                    const text = element.textContent.trim();
-                    const role = element.getAttribute('role') || '';
-
-                    // Scroll into view
-                    element.scrollIntoView({{ behavior: 'auto', block: 'center' }});
-
-                    // Click the element
-                    element.click();
-
-                    return {{ 
-                        success: true, 
-                        method: method,
-                        xpath: elementXPath,
-                        tag: tagName,
-                        text: text,
-                        role: role,
-                        selector: '{selector}'
-                    }};
-                }}
-
-                return {{ 
-                    success: false, 
-                    message: `Custom element not found with selector: ${{'{selector}'}}${{'{attribute}' ? ` and ${{'{attribute}'}}="${{'{value}'}}"` : ''}}` 
-                }};
-            }} catch (e) {{
-                return {{ 
-                    success: false, 
-                    message: `Error clicking custom element: ${{e.message}}` 
-                }};
-            }}
-        }})();
-        """
-
-        self.web_view.page().runJavaScript(js_script, self._handle_click_custom_element_result)
+        attribute = attribute or ""
+        value = "" if value is None else str(value)
+        self.web_view.page().runJavaScript(
+            f"window.__sage.clickCustomElement({json.dumps(str(selector))}, {json.dumps(attribute)}, {json.dumps(value)})",
+            QWebEngineScript.ScriptWorldId.ApplicationWorld.value,
+            self._handle_click_custom_element_result
+        )
 
     def _handle_click_custom_element_result(self, result):
         """Handle the result of a custom element click operation"""
         if result.get('success'):
-            self.browser.chat_window.add_message(
-                f"✓ Clicked custom element\n" +
-                f"  Text: {result.get('text') or 'none'}\n" +
-                f"  Tag: {result.get('tag')}\n" +
-                f"  Role: {result.get('role') or 'none'}\n" +
-                f"  Found by: {result.get('method')}\n" +
-                f"  XPath: {result.get('xpath')}",
-                Role.WEB_BROWSER
+            self._post_message(
+                f"✓ Clicked custom element\n"
+                f"  Text: {result.get('text') or 'none'}\n"
+                f"  Tag: {result.get('tag')}\n"
+                f"  Role: {result.get('role') or 'none'}\n"
+                f"  Found by: {result.get('method')}\n"
+                f"  XPath: {result.get('xpath')}"
             )
         else:
-            self.browser.chat_window.add_message(
-                f"✗ Failed to click custom element: {result.get('message')}",
-                Role.WEB_BROWSER
-            )
+            self._post_message(f"✗ Failed to click custom element: {result.get('message')}")
 
     def click_element(self, selector):
         """Click an element using JavaScript in QWebEngineView"""
-        js_script = f"""
-        (function() {{
-            // Helper function to find elements by text or other attributes
-            function findClickableElement(selector) {{
-                // Try direct CSS selector first
-                try {{
-                    const element = document.querySelector(selector);
-                    if (element) return {{ element, method: 'css_selector' }};
-                }} catch (e) {{
-                    // Invalid selector, continue with other methods
-                }}
-
-                // Try by visible text content
-                const allElements = document.querySelectorAll('a, button, [role="button"], .btn, input[type="button"], input[type="submit"]');
-                for (const el of allElements) {{
-                    if (el.textContent && el.textContent.toLowerCase().includes(selector.toLowerCase())) {{
-                        return {{ element: el, method: 'text_content' }};
-                    }}
-                }}
-
-                // Try by aria-label, title, etc.
-                const labelSelectors = [
-                    `[aria-label*="{selector}" i]`,
-                    `[title*="{selector}" i]`,
-                    `[alt*="{selector}" i]`,
-                    `[data-testid*="{selector}" i]`
-                ];
-
-                for (const labelSelector of labelSelectors) {{
-                    try {{
-                        const element = document.querySelector(labelSelector);
-                        if (element) return {{ element, method: 'attribute', selector: labelSelector }};
-                    }} catch (e) {{
-                        // Invalid selector, continue
-                    }}
-                }}
-
-                return {{ element: null, method: 'none' }};
-            }}
-
-            // Function to get XPath of an element
-            function getXPath(element) {{
-                if (!element) return null;
-
-                // If it has an ID, use that
-                if (element.id) {{
-                    return `//*[@id="${{element.id}}"]`;
-                }}
-
-                // Otherwise build an XPath
-                let path = '';
-                let current = element;
-
-                while (current && current.nodeType === 1) {{
-                    let index = 1;
-                    let sibling = current.previousSibling;
-
-                    while (sibling) {{
-                        if (sibling.nodeType === 1 && sibling.tagName === current.tagName) {{
-                            index++;
-                        }}
-                        sibling = sibling.previousSibling;
-                    }}
-
-                    const tagName = current.tagName.toLowerCase();
-                    const pathIndex = (index > 1) ? `[${{index}}]` : '';
-                    path = `/${{tagName}}${{pathIndex}}${{path}}`;
-
-                    current = current.parentNode;
-                }}
-
-                return path;
-            }}
-
-            const result = findClickableElement('{selector}');
-            if (result.element) {{
-                const xpath = getXPath(result.element);
-                result.element.click();
-                return {{ 
-                    success: true, 
-                    selector: '{selector}', 
-                    method: result.method,
-                    xpath: xpath,
-                    tag: result.element.tagName
-                }};
-            }}
-
-            return {{ success: false, selector: '{selector}', message: 'Element not found' }};
-        }})();
-        """
-
-        # Execute JavaScript and handle result with a callback
-        self.web_view.page().runJavaScript(js_script, self._handle_click_result)
+        self.web_view.page().runJavaScript(
+            f"window.__sage.clickElement({json.dumps(str(selector))})",
+            QWebEngineScript.ScriptWorldId.ApplicationWorld.value,
+            self._handle_click_result
+        )
 
     def _handle_click_result(self, result):
         """Handle the result of a click operation"""
         if result.get('success'):
-            self.browser.chat_window.add_message(
-                f"✓ Clicked element '{result.get('selector')}' (found by {result.get('method')})\n" +
-                f"  XPath: {result.get('xpath')}",
-                Role.WEB_BROWSER
+            self._post_message(
+                f"✓ Clicked element '{result.get('selector')}' (found by {result.get('method')})\n"
+                f"  XPath: {result.get('xpath')}"
             )
         else:
-            self.browser.chat_window.add_message(
-                f"✗ Failed to click element '{result.get('selector')}': {result.get('message')}",
-                Role.WEB_BROWSER
+            self._post_message(
+                f"✗ Failed to click element '{result.get('selector')}': {result.get('message')}"
             )
 
     def submit_form(self, selector="form"):
         """Submit a form using JavaScript in QWebEngineView"""
-        js_script = f"""
-        (function() {{
-            // Find and submit the form or click a submit button
-            try {{
-                // Improved function to get XPath of an element
-                function getXPath(element) {{
-                    if (!element) return "/none";  // Return a clear indicator when element is null
-
-                    // If it has an ID, use that
-                    if (element.id) return `//*[@id="${{element.id}}"]`;
-
-                    // Otherwise build an XPath
-                    let path = '';
-                    let current = element;
-
-                    while (current && current.nodeType === 1) {{
-                        let index = 1;
-                        let sibling = current.previousSibling;
-
-                        while (sibling) {{
-                            if (sibling.nodeType === 1 && sibling.tagName === current.tagName) {{
-                                index++;
-                            }}
-                            sibling = sibling.previousSibling;
-                        }}
-
-                        const tagName = current.tagName.toLowerCase();
-                        const pathIndex = (index > 1) ? `[${{index}}]` : '';
-                        path = `/${{tagName}}${{pathIndex}}${{path}}`;
-
-                        current = current.parentNode;
-
-                        // Break if we've reached the body or document
-                        if (!current || current.tagName === 'BODY' || current === document) break;
-                    }}
-
-                    return path || "/unknown";  // Return a fallback if path is empty
-                }}
-
-                // PRIORITY CHANGE: First look for submit buttons since we want to click them
-                // Look for submit buttons with increasing specificity
-                const buttonSelectors = [
-                    'button[type="submit"]',
-                    'input[type="submit"]',
-                    '.form-submit-button',
-                    'button.submit',
-                    'button.submit-button',
-                    'button.primary:not([role="reset"])',
-                    'button:contains("Submit")',
-                    'button:contains("Send")',
-                    'button:contains("Save")'
-                ];
-
-                // Try each selector
-                for (const buttonSelector of buttonSelectors) {{
-                    try {{
-                        const buttons = document.querySelectorAll(buttonSelector);
-                        if (buttons.length > 0) {{
-                            // Click the first visible button
-                            for (const btn of buttons) {{
-                                const style = window.getComputedStyle(btn);
-                                if (style.display !== 'none' && style.visibility !== 'hidden' && btn.offsetParent !== null) {{
-                                    const rect = btn.getBoundingClientRect();
-                                    if (rect.width > 0 && rect.height > 0) {{
-                                        // Important: Get the XPath BEFORE clicking
-                                        const buttonXPath = getXPath(btn);
-                                        const buttonText = btn.textContent.trim() || btn.value || "Submit Button";
-
-                                        // Now click the button
-                                        btn.click();
-
-                                        return {{ 
-                                            success: true, 
-                                            method: 'submit_button_click', 
-                                            buttonText: buttonText,
-                                            xpath: buttonXPath,
-                                            element: buttonSelector
-                                        }};
-                                    }}
-                                }}
-                            }}
-                        }}
-                    }} catch (e) {{
-                        // Skip invalid selectors or errors
-                        console.log("Button selector error:", e);
-                    }}
-                }}
-
-                // Manual search for any button that looks like a submit button
-                const allButtons = Array.from(document.querySelectorAll('button, input[type="button"], [role="button"]'));
-                const submitKeywords = ['submit', 'send', 'save', 'continue', 'next', 'finish', 'complete', 'done'];
-
-                for (const btn of allButtons) {{
-                    const buttonText = (btn.textContent || btn.value || '').toLowerCase();
-                    const matchesKeyword = submitKeywords.some(keyword => buttonText.includes(keyword));
-
-                    // Check if any attribute or class suggests it's a submit button
-                    const hasSubmitClass = btn.className.toLowerCase().includes('submit') || 
-                                          btn.className.toLowerCase().includes('primary');
-
-                    if (matchesKeyword || hasSubmitClass) {{
-                        try {{
-                            // Important: Get the XPath BEFORE clicking
-                            const buttonXPath = getXPath(btn);
-                            const displayText = btn.textContent.trim() || btn.value || "Button";
-                            const keyword = matchesKeyword ? 
-                                submitKeywords.find(k => buttonText.includes(k)) : 'class-based';
-
-                            // Now click the button
-                            btn.click();
-
-                            return {{ 
-                                success: true, 
-                                method: 'keyword_button_click', 
-                                buttonText: displayText,
-                                keyword: keyword,
-                                xpath: buttonXPath
-                            }};
-                        }} catch (e) {{
-                            console.log("Button click error:", e);
-                        }}
-                    }}
-                }}
-
-                // Try with the custom selector if provided
-                if ('{selector}' !== 'form') {{
-                    const customElement = document.querySelector('{selector}');
-                    if (customElement) {{
-                        // Is it a form?
-                        if (customElement.tagName === 'FORM') {{
-                            customElement.submit();
-                            return {{ 
-                                success: true, 
-                                method: 'custom_form_submit', 
-                                formId: customElement.id || 'unnamed',
-                                xpath: getXPath(customElement)
-                            }};
-                        }}
-
-                        // Is it a button or clickable element?
-                        else if (customElement.tagName === 'BUTTON' || 
-                                 customElement.tagName === 'INPUT' ||
-                                 customElement.getAttribute('role') === 'button') {{
-
-                            // Get XPath before clicking
-                            const elementXPath = getXPath(customElement);
-                            const elementText = customElement.textContent.trim() || customElement.value || "Custom Element";
-
-                            // Click the element
-                            customElement.click();
-
-                            return {{ 
-                                success: true, 
-                                method: 'custom_element_click', 
-                                elementText: elementText,
-                                xpath: elementXPath,
-                                selector: '{selector}'
-                            }};
-                        }}
-                    }}
-                }}
-
-                // Try to submit any form as a last resort
-                const form = document.querySelector('form');
-                if (form) {{
-                    try {{
-                        const formXPath = getXPath(form);
-                        form.submit();
-                        return {{ 
-                            success: true, 
-                            method: 'form_submit', 
-                            formId: form.id || 'unnamed',
-                            xpath: formXPath
-                        }};
-                    }} catch (e) {{
-                        // Form submission error
-                        console.log("Form submit error:", e);
-                    }}
-                }}
-
-                // If we got here, we didn't find any submit button or form
-                return {{ success: false, message: 'No submit button or form found' }};
-            }} catch (e) {{
-                return {{ success: false, message: `Error during form submission: ${{e.message}}` }};
-            }}
-        }})();
-        """
-
-        # Execute JavaScript and handle result with a callback
-        self.web_view.page().runJavaScript(js_script, self._handle_submit_result)
+        self.web_view.page().runJavaScript(
+            f"window.__sage.submitForm({json.dumps(str(selector))})",
+            QWebEngineScript.ScriptWorldId.ApplicationWorld.value,
+            self._handle_submit_result
+        )
 
     def _handle_submit_result(self, result):
         """Handle the result of a form submission"""
@@ -2668,178 +3304,143 @@ class WebViewAutomator:
             method = result.get('method', '')
 
             if method == 'submit_button_click':
-                self.browser.chat_window.add_message(
-                    f"✓ Clicked submit button '{result.get('buttonText')}'\n" +
-                    f"  XPath: {result.get('xpath')}\n" +
-                    f"  Selector: {result.get('element')}",
-                    Role.WEB_BROWSER
+                self._post_message(
+                    f"✓ Clicked submit button '{result.get('buttonText')}'\n"
+                    f"  XPath: {result.get('xpath')}\n"
+                    f"  Selector: {result.get('element')}"
                 )
             elif method == 'keyword_button_click':
-                self.browser.chat_window.add_message(
-                    f"✓ Clicked button with text '{result.get('buttonText')}'\n" +
-                    f"  XPath: {result.get('xpath')}\n" +
-                    f"  Keyword match: {result.get('keyword')}",
-                    Role.WEB_BROWSER
+                self._post_message(
+                    f"✓ Clicked button with text '{result.get('buttonText')}'\n"
+                    f"  XPath: {result.get('xpath')}\n"
+                    f"  Keyword match: {result.get('keyword')}"
                 )
             elif method == 'custom_element_click':
-                self.browser.chat_window.add_message(
-                    f"✓ Clicked custom element '{result.get('elementText')}'\n" +
-                    f"  XPath: {result.get('xpath')}\n" +
-                    f"  Selector: {result.get('selector')}",
-                    Role.WEB_BROWSER
+                self._post_message(
+                    f"✓ Clicked custom element '{result.get('elementText')}'\n"
+                    f"  XPath: {result.get('xpath')}\n"
+                    f"  Selector: {result.get('selector')}"
                 )
             elif method == 'form_submit':
-                self.browser.chat_window.add_message(
-                    f"✓ Form submitted programmatically\n" +
-                    f"  Form ID: {result.get('formId')}\n" +
-                    f"  XPath: {result.get('xpath')}",
-                    Role.WEB_BROWSER
+                self._post_message(
+                    f"✓ Form submitted programmatically\n"
+                    f"  Form ID: {result.get('formId')}\n"
+                    f"  XPath: {result.get('xpath')}"
                 )
             elif method == 'custom_form_submit':
-                self.browser.chat_window.add_message(
-                    f"✓ Custom form submitted programmatically\n" +
-                    f"  Form ID: {result.get('formId')}\n" +
-                    f"  XPath: {result.get('xpath')}",
-                    Role.WEB_BROWSER
+                self._post_message(
+                    f"✓ Custom form submitted programmatically\n"
+                    f"  Form ID: {result.get('formId')}\n"
+                    f"  XPath: {result.get('xpath')}"
                 )
             else:
-                self.browser.chat_window.add_message(
-                    f"✓ Form submitted via {method}\n" +
-                    f"  XPath: {result.get('xpath', 'Unknown')}",
-                    Role.WEB_BROWSER
+                self._post_message(
+                    f"✓ Form submitted via {method}\n"
+                    f"  XPath: {result.get('xpath', 'Unknown')}"
                 )
         else:
-            self.browser.chat_window.add_message(
-                f"✗ Failed to submit form: {result.get('message')}",
-                Role.WEB_BROWSER
-            )
+            self._post_message(f"✗ Failed to submit form: {result.get('message')}")
 
     def debug_element(self, selector):
         """Debug element properties using JavaScript in QWebEngineView"""
-        js_script = f"""
-        (function() {{
-            try {{
-                // Function to get XPath of an element
-                function getXPath(element) {{
-                    if (!element) return null;
-
-                    // If it has an ID, use that
-                    if (element.id) {{
-                        return `//*[@id="${{element.id}}"]`;
-                    }}
-
-                    // Otherwise build an XPath
-                    let path = '';
-                    let current = element;
-
-                    while (current && current.nodeType === 1) {{
-                        let index = 1;
-                        let sibling = current.previousSibling;
-
-                        while (sibling) {{
-                            if (sibling.nodeType === 1 && sibling.tagName === current.tagName) {{
-                                index++;
-                            }}
-                            sibling = sibling.previousSibling;
-                        }}
-
-                        const tagName = current.tagName.toLowerCase();
-                        const pathIndex = (index > 1) ? `[${{index}}]` : '';
-                        path = `/${{tagName}}${{pathIndex}}${{path}}`;
-
-                        current = current.parentNode;
-                    }}
-
-                    return path;
-                }}
-
-                const element = document.querySelector('{selector}');
-                if (!element) {{
-                    return {{ found: false, message: 'Element not found' }};
-                }}
-
-                // Get all attributes
-                const attributes = {{}};
-                for (const attr of element.attributes) {{
-                    attributes[attr.name] = attr.value;
-                }}
-
-                // Get computed styles
-                const styles = {{}};
-                const computed = window.getComputedStyle(element);
-                ['display', 'visibility', 'position', 'z-index', 'pointer-events'].forEach(
-                    prop => styles[prop] = computed[prop]
-                );
-
-                return {{
-                    found: true,
-                    tagName: element.tagName,
-                    id: element.id,
-                    className: element.className,
-                    type: element.type,
-                    value: element.value,
-                    checked: element.checked,
-                    disabled: element.disabled,
-                    readOnly: element.readOnly,
-                    attributes: attributes,
-                    styles: styles,
-                    rect: {{
-                        top: element.getBoundingClientRect().top,
-                        right: element.getBoundingClientRect().right,
-                        bottom: element.getBoundingClientRect().bottom,
-                        left: element.getBoundingClientRect().left,
-                        width: element.getBoundingClientRect().width,
-                        height: element.getBoundingClientRect().height
-                    }},
-                    isVisible: element.offsetWidth > 0 && element.offsetHeight > 0,
-                    html: element.outerHTML.substring(0, 500), // Limit HTML to 500 chars
-                    xpath: getXPath(element)
-                }};
-            }} catch (e) {{
-                return {{ found: false, message: 'Error: ' + e.message }};
-            }}
-        }})();
-        """
-
-        # Execute JavaScript and handle result with a callback
-        self.web_view.page().runJavaScript(js_script, self._handle_debug_result)
+        self.web_view.page().runJavaScript(
+            f"window.__sage.debugElement({json.dumps(str(selector))})",
+            QWebEngineScript.ScriptWorldId.ApplicationWorld.value,
+            self._handle_debug_result
+        )
 
     def _handle_debug_result(self, element_info):
         """Handle the result of a debug operation"""
         if element_info.get('found', False):
-            result = "Element Debug Info:\n"
-            result += f"TagName: {element_info.get('tagName')}\n"
-            result += f"ID: {element_info.get('id')}\n"
-            result += f"Class: {element_info.get('className')}\n"
-            result += f"Type: {element_info.get('type')}\n"
-            result += f"Value: {element_info.get('value')}\n"
-            result += f"Disabled: {element_info.get('disabled')}\n"
-            result += f"ReadOnly: {element_info.get('readOnly')}\n"
-            result += f"Visible: {element_info.get('isVisible')}\n"
-            result += f"XPath: {element_info.get('xpath')}\n"
+            lines = [
+                "Element Debug Info:\n"
+                f"TagName: {element_info.get('tagName')}\n"
+                f"ID: {element_info.get('id')}\n"
+                f"Class: {element_info.get('className')}\n"
+                f"Type: {element_info.get('type')}\n"
+                f"Value: {element_info.get('value')}\n"
+                f"Disabled: {element_info.get('disabled')}\n"
+                f"ReadOnly: {element_info.get('readOnly')}\n"
+                f"Visible: {element_info.get('isVisible')}\n"
+                f"XPath: {element_info.get('xpath')}\n"
+            ]
 
             # Attributes
-            result += "\nAttributes:\n"
+            lines.append("\nAttributes:\n")
             for name, value in element_info.get('attributes', {}).items():
-                result += f"  {name}: {value}\n"
+                lines.append(f"  {name}: {value}\n")
 
             # Styles
-            result += "\nStyles:\n"
+            lines.append("\nStyles:\n")
             for name, value in element_info.get('styles', {}).items():
-                result += f"  {name}: {value}\n"
+                lines.append(f"  {name}: {value}\n")
 
             # HTML preview
-            result += f"\nHTML Preview:\n{element_info.get('html', '')}"
+            lines.append(f"\nHTML Preview:\n{element_info.get('html', '')}")
 
-            self.browser.chat_window.add_message(result, Role.WEB_BROWSER)
+            self._post_message("".join(lines))
         else:
-            self.browser.chat_window.add_message(
-                f"Could not find element: {element_info.get('message')}",
-                Role.WEB_BROWSER
-            )
+            self._post_message(f"Could not find element: {element_info.get('message')}")
+
+    def _action_call(self, action):
+        """Return the helper name, arguments and result handler for a batch action"""
+        op = action.get('op')
+        selector = str(action.get('selector', ''))
+
+        if op == 'select_option':
+            return 'selectOption', [selector, str(action.get('value'))], self._handle_select_option_result
+        if op == 'check_radio':
+            value = action.get('value')
+            value = "" if value is None else str(value)
+            return 'checkRadio', [selector, value], self._handle_check_radio_result
+        if op == 'check_checkbox':
+            return 'checkCheckbox', [selector, bool(action.get('check', True))], self._handle_check_checkbox_result
+        if op == 'click_custom_element':
+            value = action.get('value')
+            value = "" if value is None else str(value)
+            attribute = action.get('attribute') or ""
+            return 'clickCustomElement', [selector, attribute, value], self._handle_click_custom_element_result
+        if op == 'click_element':
+            return 'clickElement', [selector], self._handle_click_result
+        if op == 'submit_form':
+            return 'submitForm', [str(action.get('selector', 'form'))], self._handle_submit_result
+        return None
+
+    def execute_batch(self, actions):
+        """Run a list of page actions in order with a single JavaScript call"""
+        calls = []
+        handlers = []
+        for action in actions:
+            call = self._action_call(action)
+            if call is None:
+                self._post_message(f"✗ Unknown action: {action.get('op')}")
+                continue
+            name, args, handler = call
+            calls.append([name, args])
+            handlers.append(handler)
+
+        if not calls:
+            return
+
+        self.web_view.page().runJavaScript(
+            f"window.__sage.runActions({json.dumps(calls)})",
+            QWebEngineScript.ScriptWorldId.ApplicationWorld.value,
+            lambda results: self._handle_batch_result(handlers, results)
+        )
+
+    def _handle_batch_result(self, handlers, results):
+        """Pass each batch action's result to its usual handler"""
+        if results is None:
+            self._post_message("⚠️ Error processing batch result: received None")
+            return
+
+        for handler, result in zip(handlers, results):
+            handler(result)
 
 
 class Browser(QMainWindow):
+    HOME_URL = "https://docs.google.com/forms/d/e/1FAIpQLSfytBk_bpiAWDSiYkPbf7KS0rJAj2kbETbfSh0xVkJroMpoOw/viewform"
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Sage Browser")
@@ -2849,6 +3450,17 @@ class Browser(QMainWindow):
         # Initialize WebView automator instead of PlaywrightController
         self.web_automator = WebViewAutomator(self)
 
+        # Page analyses arriving within a short window are sent as one LLM request
+        self._analyze_queue = []
+        self._analyze_timer = QTimer(self)
+        self._analyze_timer.setSingleShot(True)
+        self._analyze_timer.setInterval(100)
+        self._analyze_timer.timeout.connect(self._flush_analyze_queue)
+
+        # Start loading the home page once the event loop runs, so the window is
+        # shown before the renderer process spins up and the first fetch starts
+        QTimer.singleShot(0, lambda: self.web_view.setUrl(QUrl(self.HOME_URL)))
+
     def setup_ui(self):
         # Create main widget and layout
         main_widget = QWidget()
@@ -2862,17 +3474,28 @@ class Browser(QMainWindow):
         browser_widget = QWidget()
         browser_layout = QVBoxLayout(browser_widget)
 
+        # Web view setup with a persistent profile so reloads can be served from disk cache
+        self.profile = self.create_profile()
+        self.web_view = QWebEngineView()
+        self.web_page = AnalyzingWebPage(self, profile=self.profile)
+        self.web_view.setPage(self.web_page)
+        self.web_view.urlChanged.connect(self.update_url)
+
         # Navigation controls
         nav_layout = QHBoxLayout()
         self.url_bar = QLineEdit()
         self.url_bar.returnPressed.connect(self.navigate_to_url)
 
-        back_btn = QPushButton("←")
-        back_btn.clicked.connect(self.back)
-        forward_btn = QPushButton("→")
-        forward_btn.clicked.connect(self.forward)
-        reload_btn = QPushButton("↻")
-        reload_btn.clicked.connect(self.reload)
+        # Toolbar buttons are wired straight to the view's slots
+        direct = Qt.ConnectionType.DirectConnection
+        back_btn = self.create_tool_button("←")
+        back_btn.clicked.connect(self.web_view.back, direct)
+        forward_btn = self.create_tool_button("→")
+        forward_btn.clicked.connect(self.web_view.forward, direct)
+        reload_btn = self.create_tool_button("↻")
+        # A reload is the user's signal that the page may have changed
+        reload_btn.clicked.connect(self.web_page.clear_cache, direct)
+        reload_btn.clicked.connect(self.web_view.reload, direct)
         analyze_btn = QPushButton("🔍 Analyze")
         analyze_btn.clicked.connect(self.analyze_current_page)
 
@@ -2882,13 +3505,6 @@ class Browser(QMainWindow):
         nav_layout.addWidget(self.url_bar)
         nav_layout.addWidget(analyze_btn)
 
-        # Web view setup
-        self.web_view = QWebEngineView()
-        self.web_page = AnalyzingWebPage(self)
-        self.web_view.setPage(self.web_page)
-        self.web_view.setUrl(QUrl("https://docs.google.com/forms/d/e/1FAIpQLSfytBk_bpiAWDSiYkPbf7KS0rJAj2kbETbfSh0xVkJroMpoOw/viewform"))
-        self.web_view.urlChanged.connect(self.update_url)
-
         browser_layout.addLayout(nav_layout)
         browser_layout.addWidget(self.web_view)
 
@@ -2909,6 +3525,24 @@ class Browser(QMainWindow):
         # Set window size
         self.resize(1200, 800)
 
+    def create_tool_button(self, text):
+        """Create a flat toolbar button"""
+        button = QToolButton()
+        button.setText(text)
+        button.setAutoRaise(True)
+        return button
+
+    def create_profile(self):
+        """Create a persistent web profile with an on-disk HTTP cache"""
+        profile = QWebEngineProfile("sage", self)
+        profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+        profile.setPersistentCookiesPolicy(
+            QWebEngineProfile.PersistentCookiesPolicy.AllowPersistentCookies
+        )
+        profile.setCachePath(os.path.expanduser("~/.cache/sage"))
+        profile.setPersistentStoragePath(os.path.expanduser("~/.local/share/sage"))
+        return profile
+
     def setup_browser_commands(self):
         """Set up additional browser command functionality"""
         pass
@@ -2922,22 +3556,24 @@ class Browser(QMainWindow):
     def update_url(self, url):
         self.url_bar.setText(url.toString())
 
-    def back(self):
-        self.web_view.back()
-
-    def forward(self):
-        self.web_view.forward()
-
-    def reload(self):
-        self.web_view.reload()
-
     def analyze_current_page(self):
         """Explicitly request content analysis when button clicked"""
         self.web_page.analyze_content(True)
 
-    def handle_chat_message(self, message: str):
+    def handle_chat_message(self, message: str, page_context: dict = None):
         if hasattr(self, 'llm_integration'):
-            self.llm_integration.handle_user_message(message)
+            self.llm_integration.handle_user_message(message, page_context)
+
+    def queue_page_analysis(self, prompt: str, page_context: dict = None):
+        """Queue a page analysis request, restarting the debounce window"""
+        self._analyze_queue.append((prompt, page_context))
+        self._analyze_timer.start()
+
+    def _flush_analyze_queue(self):
+        """Send all queued page analyses to the LLM in a single request"""
+        requests, self._analyze_queue = self._analyze_queue, []
+        if requests and hasattr(self, 'llm_integration'):
+            self.llm_integration.handle_user_message_batch(requests)
 
     def handle_browser_command(self, command, params):
         """Handle browser commands from the chat window"""
@@ -2954,6 +3590,7 @@ class Browser(QMainWindow):
             self.web_view.forward()
 
         elif command == "reload":
+            self.web_page.clear_cache()
             self.web_view.reload()
 
         elif command == "detect_form":
@@ -3004,6 +3641,12 @@ class Browser(QMainWindow):
             # Debug element properties
             self.web_automator.debug_element(params["selector"])
 
+        elif command == "batch":
+            # Run several actions in one round trip to the page
+            self.web_automator.execute_batch(params["actions"])
+
     def closeEvent(self, event):
         """Clean up resources when the browser is closed"""
+        # The page must be released before the profile it was created with
+        self.web_page.deleteLater()
         super().closeEvent(event)
\ No newline at end of file
@@ -103,6 +103,7 @@ class ChatWindow(QWidget):
             "radio": self.cmd_radio,
             "checkbox": self.cmd_checkbox,
             "custom": self.cmd_custom,
+            "batch": self.cmd_batch,
         }
 
         if command in commands:
@@ -321,6 +322,27 @@ class ChatWindow(QWidget):
 
         self.add_message(message, False)
 
+    def cmd_batch(self, args):
+        """Run several form actions in order in one call"""
+        usage = 'Usage: /batch [JSON list of actions, e.g. [{"op": "check_radio", "selector": "q1", "value": "Yes"}, {"op": "submit_form"}]]'
+        if not args:
+            self.add_message(usage, False)
+            return
+
+        try:
+            import json
+            actions = json.loads(args)
+        except json.JSONDecodeError:
+            self.add_message(usage, False)
+            return
+
+        if not isinstance(actions, list) or not actions or not all(isinstance(action, dict) for action in actions):
+            self.add_message(usage, False)
+            return
+
+        self.browser_command.emit("batch", {"actions": actions})
+        self.add_message(f"Running {len(actions)} actions: {', '.join(str(action.get('op')) for action in actions)}", False)
+
     def cmd_submit(self, args):
         """Submit a form"""
         selector = args if args else "form"
@@ -669,6 +691,8 @@ class ChatWindow(QWidget):
     /radio [name]:[value] - Select a radio button with specified value
     /checkbox [selector]:[true/false] - Check or uncheck a checkbox
     /custom [selector]:[attribute]:[value] - Click a custom element like star ratings
+    /batch [JSON list] - Run several actions in one go, each {"op": ..., "selector": ...}
+        ops: select_option, check_radio, check_checkbox, click_custom_element, click_element, submit_form
 
     /help - Show this help
     """
@@ -2,7 +2,7 @@ import asyncio
 import asyncio
 import logging
 from collections import deque
-from typing import Dict, List, AsyncIterator, Optional
+from typing import Any, Dict, List, AsyncIterator, Optional
 
 # Remove Django-specific imports
 from llama_cpp import Llama
@@ -13,6 +13,17 @@ logger = logging.getLogger(__name__)
 
 ai_models_path = "ai_models"
 
+PAGE_CONTEXT_TEMPLATE = (
+    "Current webpage (reader mode):\n"
+    "URL: %(url)s\n"
+    "Title: %(title)s\n"
+    "Description: %(description)s\n"
+    "Estimated Reading Time: %(reading_time)s minutes\n"
+    "\n"
+    "Content:\n"
+    "%(content)s..."
+)
+
 class LLMModelType:
     DEEPSEEK_R1_DISTILL_LLAMA_8B_Q8_0 = "DeepSeek-R1-Distill-Llama-8B-Q8_0.gguf"
     QWEN_2_5_3B ="qwen2.5-3b-instruct-q4_0.gguf"
@@ -65,14 +76,35 @@ class LLMInvoker:
 
         return list(history)
 
+    def format_page_context(self, page_context: Dict[str, Any]) -> str:
+        return PAGE_CONTEXT_TEMPLATE % {
+            "url": page_context.get("url", ""),
+            "title": page_context.get("title", ""),
+            "description": page_context.get("description", ""),
+            "reading_time": page_context.get("reading_time", 0),
+            "content": page_context.get("content", ""),
+        }
+
     async def async_send_message_stream(
-            self, message: str, conversation: Optional[Conversation] = None
+            self, message: str, conversation: Optional[Conversation] = None,
+            page_context: Optional[Dict[str, Any]] = None
     ) -> AsyncIterator[str]:
         logger.info(f"Starting message stream for: {message}")
 
         messages = [{"role": "system", "content": self._system_prompt}]
         total_tokens = len(self.system_tokens)
 
+        # Page context goes right after the system prompt so the prompt prefix
+        # stays identical across turns about the same page and llama.cpp can
+        # reuse its KV cache instead of re-evaluating the page content
+        if page_context:
+            context_text = self.format_page_context(page_context)
+            messages.append({"role": "system", "content": context_text})
+            total_tokens += len(self.tokenize_text(context_text))
+
+        # Messages before this index are never dropped by token management
+        prefix_length = len(messages)
+
         if conversation:
             history = await self.get_conversation_history(conversation)
             messages.extend(history)
@@ -85,8 +117,8 @@ class LLMInvoker:
             messages.append({"role": "user", "content": message})
         else:
             while (total_tokens + new_message_tokens + self.max_response_tokens > self.max_tokens
-                   and len(messages) > 1):
-                removed_message = messages.pop(1)
+                   and len(messages) > prefix_length):
+                removed_message = messages.pop(prefix_length)
                 total_tokens -= len(self.tokenize_text(removed_message["content"]))
             messages.append({"role": "user", "content": message})
 
@@ -13,14 +13,27 @@ class LLMWorker(QObject):
         super().__init__(parent)
         self.llm_client = llm_client
         self.conversation = Conversation(title="Browser Chat")
+        # Context of the most recently analyzed page, kept for follow-up questions
+        # while the browser stays on that page
+        self.page_context = None
+        self.page_context_url = None
 
-    async def process_message(self, message: str):
+    async def process_message(self, message: str, page_context: Optional[dict] = None,
+                              page_url: Optional[str] = None):
         try:
+            if page_context is not None:
+                # An empty dict sends the message without any page context
+                self.page_context = page_context or None
+                self.page_context_url = page_url
+            elif self.page_context and self.page_context_url != page_url:
+                # The browser has moved on, so the stored context no longer applies
+                self.page_context = None
+
             self.conversation.add_message(message, Role.USER)
             complete_response = ""
 
             async for response_chunk in self.llm_client.llm_chat.async_send_message_stream(
-                    message, self.conversation
+                    message, self.conversation, self.page_context
             ):
                 complete_response += response_chunk
                 self.response_ready.emit(response_chunk)
@@ -34,16 +47,21 @@ class LLMWorker(QObject):
 
 
 class LLMThread(QThread):
-    def __init__(self, worker: LLMWorker, message: str, parent=None):
+    def __init__(self, worker: LLMWorker, message: str, page_context: Optional[dict] = None,
+                 page_url: Optional[str] = None, parent=None):
         super().__init__(parent)
         self.worker = worker
         self.message = message
+        self.page_context = page_context
+        self.page_url = page_url
 
     def run(self):
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         try:
-            loop.run_until_complete(self.worker.process_message(self.message))
+            loop.run_until_complete(
+                self.worker.process_message(self.message, self.page_context, self.page_url)
+            )
         finally:
             loop.close()
 
@@ -58,7 +76,7 @@ class BrowserLLMIntegration:
         self.llm_worker.error_occurred.connect(self.handle_llm_error)
         self.auto_fill_requested = False
 
-    def handle_user_message(self, message: str):
+    def handle_user_message(self, message: str, page_context: Optional[dict] = None):
         """Process user messages and handle form fill requests"""
         # Check if this is a request to fill a form
         form_fill_phrases = [
@@ -75,9 +93,37 @@ class BrowserLLMIntegration:
             self.browser.handle_browser_command("auto_fill", {})
         else:
             # Regular LLM processing for other messages
-            self.llm_thread = LLMThread(self.llm_worker, message)
+            page_url = self.browser.web_view.url().toString()
+            self.llm_thread = LLMThread(self.llm_worker, message, page_context, page_url)
             self.llm_thread.start()
 
+    def handle_user_message_batch(self, requests):
+        """Send several queued (message, page_context) requests as one LLM request"""
+        if len(requests) == 1:
+            message, page_context = requests[0]
+            self.handle_user_message(message, page_context)
+            return
+
+        # llama.cpp evaluates one sequence at a time, so batching means a single
+        # combined prompt: one prefill and one generation instead of one per page
+        llm_chat = self.llm_worker.llm_client.llm_chat
+        sections = []
+        for i, (message, page_context) in enumerate(requests, 1):
+            section = f"### Page {i}\n"
+            if page_context:
+                section += llm_chat.format_page_context(page_context) + "\n\n"
+            section += message
+            sections.append(section)
+
+        combined = (
+            f"Answer each of the following {len(requests)} requests in turn, "
+            f"labelling each answer with its page number.\n\n" + "\n\n".join(sections)
+        )
+
+        # Each page's context is already inlined above, so none is sent alongside
+        self.llm_thread = LLMThread(self.llm_worker, combined, {})
+        self.llm_thread.start()
+
     def handle_llm_error(self, error: str):
         self.browser.chat_window.add_message(f"Error: {error}", Role.ASSISTANT)
 
@@ -135,8 +181,9 @@ Respond with JSON data only, no explanations. Example format:
         else:
             self.auto_fill_requested = False
 
-        # Start LLM thread
-        self.llm_thread = LLMThread(self.llm_worker, prompt)
+        # Start LLM thread. The prompt carries everything it needs, so no page
+        # context is sent with it.
+        self.llm_thread = LLMThread(self.llm_worker, prompt, {})
         self.llm_thread.start()
 
     def handle_llm_response(self, response: str):
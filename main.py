@@ -1,4 +1,8 @@
+import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
+
 from PyQt6.QtWidgets import QApplication
 
 from browser.browser import Browser
@@ -6,7 +10,23 @@ from lib.llm_api import SingletonLLMConnect
 from lib.llm_browser_integration import BrowserLLMIntegration
 
 
+def setup_logging(level=logging.WARNING):
+    """Route log records through a queue so formatting and I/O happen off the GUI thread"""
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, logging.StreamHandler())
+
+    root_logger = logging.getLogger()
+    root_logger.addHandler(QueueHandler(log_queue))
+    root_logger.setLevel(level)
+
+    listener.start()
+    return listener
+
+
 def main():
+    # Start background logging before any Qt objects are created
+    log_listener = setup_logging()
+
     # Initialize Qt Application
     app = QApplication(sys.argv)
     app.setStyle("Fusion")  # Set modern style
@@ -35,6 +55,10 @@ def main():
         print(f"Error starting application: {str(e)}")
         return 1
 
+    finally:
+        # Flush any queued log records
+        log_listener.stop()
+
 
 if __name__ == '__main__':
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import json
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+QtCore = pytest.importorskip("PyQt6.QtCore")
+pytest.importorskip("PyQt6.QtWebEngineCore")
+
+from browser.browser import WebViewAutomator  # noqa: E402
+
+
+class FakePage:
+    def __init__(self):
+        self.calls = []
+
+    def runJavaScript(self, script, world, callback):
+        self.calls.append((script, callback))
+
+
+class FakeWebView:
+    def __init__(self, url):
+        self._url = QtCore.QUrl(url)
+        self._page = FakePage()
+
+    def url(self):
+        return self._url
+
+    def page(self):
+        return self._page
+
+
+def make_automator(url):
+    automator = WebViewAutomator.__new__(WebViewAutomator)
+    automator.web_view = FakeWebView(url)
+    automator.browser = SimpleNamespace(chat_window=SimpleNamespace(add_message=lambda *args: None))
+    automator._xpath_cache = OrderedDict()
+    return automator
+
+
+def test_mapped_xpaths_are_reused_on_percent_encoded_urls():
+    page_url = "https://example.com/forms/sign%20up?q=caf%C3%A9"
+    automator = make_automator(page_url)
+
+    automator.map_form_fields()
+    _, callback = automator.web_view.page().calls.pop()
+    callback({
+        'success': True,
+        'title': 'Sign up',
+        # What the page reports as location.href, which QUrl.toString() decodes
+        'url': page_url,
+        'fields': [{'label': 'Email', 'type': 'email', 'xpath': '//*[@id="email"]'}],
+    })
+
+    automator.fill_form({'Email': 'a@example.com'})
+    script, _ = automator.web_view.page().calls.pop()
+
+    entries = [['//*[@id="email"]', 'a@example.com']]
+    assert script == f"window.__sage.fillByXPathBatch({json.dumps(entries)})"
+    assert not automator.web_view.page().calls